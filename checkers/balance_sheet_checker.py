@@ -1,18 +1,65 @@
 """Balance sheet equation checker (V8 Gate D)."""
 
 import re
+from collections import defaultdict
+from functools import lru_cache
 from typing import Optional
 
 from checkers.base import BaseChecker
+from checkers.document_index import DocumentIndex
 from src.schemas.models import (
     BalanceCheck,
+    Cell,
     Document,
     Finding,
-    FinancialType,
     Severity,
     Table,
 )
 
+# Balance sheet total rows: named group "a" = assets, "l" = liabilities (Finnish and English)
+_TOTAL_RE = re.compile(
+    r"(?P<a>vastaavaa\s*(?:yhteensä|yht)|total\s+assets|assets\s+total|yhteensä\s+vastaavaa)"
+    r"|(?P<l>vastattavaa\s*(?:yhteensä|yht)|total\s+liabilities|liabilities\s+total"
+    r"|yhteensä\s+vastattavaa)",
+    re.IGNORECASE,
+)
+
+# Number cleanup: drop spaces/units, Finnish decimal comma -> dot
+_NUM_STRIP = str.maketrans({" ": None, "€": None, "%": None, ",": "."})
+_NUM_RE = re.compile(r"-?\d+\.?\d*")
+
+
+@lru_cache(maxsize=4096)
+def _parse_number(text: str) -> Optional[float]:
+    """Parse number from text (handles Finnish formatting); cached since tables repeat values."""
+    if not text or not text.strip():
+        return None
+    
+    # Remove spaces and units, handle Finnish thousand/decimal separators
+    text = text.strip().replace("t€", "").translate(_NUM_STRIP)
+    
+    # Handle parentheses as negative
+    is_negative = text.startswith("(") and text.endswith(")")
+    if is_negative:
+        text = text[1:-1]
+    
+    # Fast path: plain "123", "-123.45" parse directly in C without the regex
+    digits = text[1:] if text.startswith("-") else text
+    if digits[:1].isdigit() and digits.isascii() and digits.replace(".", "", 1).isdigit():
+        value = float(text)
+        return -value if is_negative else value
+    
+    # Extract number
+    match = _NUM_RE.search(text)
+    if match:
+        try:
+            value = float(match.group())
+            return -value if is_negative else value
+        except ValueError:
+            pass
+    
+    return None
+
 
 class BalanceSheetChecker(BaseChecker):
     """
@@ -29,28 +76,7 @@ class BalanceSheetChecker(BaseChecker):
 
     def parse_number(self, text: str) -> Optional[float]:
         """Parse number from text (handles Finnish formatting)."""
-        if not text or not text.strip():
-            return None
-        
-        # Remove spaces, handle Finnish thousand/decimal separators
-        text = text.strip().replace(" ", "").replace(",", ".")
-        text = text.replace("€", "").replace("t€", "").replace("%", "")
-        
-        # Handle parentheses as negative
-        is_negative = text.startswith("(") and text.endswith(")")
-        if is_negative:
-            text = text[1:-1]
-        
-        # Extract number
-        match = re.search(r"-?\d+\.?\d*", text)
-        if match:
-            try:
-                value = float(match.group())
-                return -value if is_negative else value
-            except ValueError:
-                pass
-        
-        return None
+        return _parse_number(text)
 
     def find_balance_totals(self, table: Table) -> tuple[Optional[float], Optional[float]]:
         """
@@ -65,122 +91,93 @@ class BalanceSheetChecker(BaseChecker):
         if not table.cells:
             return None, None
         
-        # Keywords for assets (Finnish and English)
-        assets_keywords = [
-            "vastaavaa yhteensä",
-            "vastaavaa yht",
-            "total assets",
-            "assets total",
-            "yhteensä vastaavaa",
-        ]
-        
-        # Keywords for liabilities (Finnish and English)
-        liabilities_keywords = [
-            "vastattavaa yhteensä",
-            "vastattavaa yht",
-            "total liabilities",
-            "liabilities total",
-            "yhteensä vastattavaa",
-        ]
-        
         # Group cells by row
-        rows: dict[int, list] = {}
+        rows: defaultdict[int, list[Cell]] = defaultdict(list)
         for cell in table.cells:
-            if cell.row not in rows:
-                rows[cell.row] = []
             rows[cell.row].append(cell)
         
-        # Check each row for totals
-        for row_idx, row_cells in sorted(rows.items()):
+        # Check each row for totals, bottom-up (totals are usually the last rows)
+        for row_idx, row_cells in sorted(rows.items(), reverse=True):
             if not row_cells:
                 continue
             
             # Get row text (first cell usually has label)
-            row_text = row_cells[0].text_raw.lower().strip()
+            match = _TOTAL_RE.search(row_cells[0].text_raw)
+            if match is None:
+                continue
             
-            # Get numeric values from rest of row
+            # Get numeric values from rest of row (value_num is pre-parsed by step 60 normalize)
             numeric_values: list[float] = []
             for cell in row_cells[1:]:
-                value = self.parse_number(cell.text_raw)
+                value = cell.value_num
+                if value is None:
+                    value = self.parse_number(cell.text_raw)
                 if value is not None:
                     numeric_values.append(value)
             
-            # Check for assets total
-            if any(kw in row_text for kw in assets_keywords):
-                if numeric_values:
-                    # Take last numeric value (typically the total)
+            if not numeric_values:
+                continue
+            
+            # Take last numeric value (typically the total); the lowest matching row wins
+            if match.lastgroup == "a":
+                if assets_total is None:
                     assets_total = numeric_values[-1]
+            elif liabilities_total is None:
+                liabilities_total = numeric_values[-1]
             
-            # Check for liabilities total
-            if any(kw in row_text for kw in liabilities_keywords):
-                if numeric_values:
-                    liabilities_total = numeric_values[-1]
+            if assets_total is not None and liabilities_total is not None:
+                break
         
         return assets_total, liabilities_total
 
-    def check(self, document: Document) -> list[Finding]:
+    def check(
+        self, document: Document, index: Optional[DocumentIndex] = None
+    ) -> list[Finding]:
         """Check balance sheet equation."""
         findings: list[Finding] = []
         balance_checks: list[BalanceCheck] = []
         
-        for page in document.pages:
-            # Only check pages classified as balance sheet
-            if page.semantic_section != "balance_sheet":
-                # Also check items for balance sheet type
-                has_balance_table = any(
-                    isinstance(item, Table) 
-                    and item.financial_type == FinancialType.BALANCE_SHEET
-                    for item in page.items
-                )
-                if not has_balance_table:
-                    continue
+        if index is None:
+            index = DocumentIndex.from_document(document)
+        
+        # Only balance sheet tables are checked (index pre-filters by financial_type)
+        for page, table in index.balance_sheet_tables:
+            # Find totals
+            assets_total, liabilities_total = self.find_balance_totals(table)
             
-            for item in page.items:
-                if not isinstance(item, Table):
-                    continue
-                
-                table = item
+            if assets_total is not None and liabilities_total is not None:
+                difference = abs(assets_total - liabilities_total)
                 
-                # Skip if not a balance sheet table
-                if table.financial_type != FinancialType.BALANCE_SHEET:
-                    continue
+                # Determine severity based on difference
+                # Allow small rounding differences (0.5% tolerance)
+                tolerance = max(abs(assets_total), abs(liabilities_total)) * 0.005
                 
-                # Find totals
-                assets_total, liabilities_total = self.find_balance_totals(table)
-                
-                if assets_total is not None and liabilities_total is not None:
-                    difference = abs(assets_total - liabilities_total)
-                    
-                    # Determine severity based on difference
-                    # Allow small rounding differences (0.5% tolerance)
-                    tolerance = max(abs(assets_total), abs(liabilities_total)) * 0.005
+                if difference > tolerance:
+                    severity = Severity.WARNING if difference < tolerance * 10 else Severity.ERROR
                     
-                    if difference > tolerance:
-                        severity = Severity.WARNING if difference < tolerance * 10 else Severity.ERROR
-                        
-                        findings.append(
-                            Finding(
-                                checker=self.name,
-                                page_index=page.page_index,
-                                table_id=table.table_id,
-                                reason=(
-                                    f"Balance sheet equation mismatch: "
-                                    f"Assets={assets_total:,.2f}, Liabilities={liabilities_total:,.2f}, "
-                                    f"Difference={difference:,.2f}"
-                                ),
-                                severity=severity,
-                            )
+                    findings.append(
+                        Finding(
+                            checker=self.name,
+                            page_index=page.page_index,
+                            table_id=table.table_id,
+                            reason=(
+                                f"Balance sheet equation mismatch: "
+                                f"Assets={assets_total:,.2f}, Liabilities={liabilities_total:,.2f}, "
+                                f"Difference={difference:,.2f}"
+                            ),
+                            severity=severity,
                         )
-                        
-                        balance_checks.append(
-                            BalanceCheck(
-                                page_index=page.page_index,
-                                table_id=table.table_id,
-                                assets=assets_total,
-                                liabilities=liabilities_total,
-                                difference=difference,
-                                severity=severity,
-                            )
+                    )
+                    
+                    balance_checks.append(
+                        BalanceCheck(
+                            page_index=page.page_index,
+                            table_id=table.table_id,
+                            assets=assets_total,
+                            liabilities=liabilities_total,
+                            difference=difference,
+                            severity=severity,
                         )
+                    )
         
         return findings
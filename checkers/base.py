@@ -1,7 +1,9 @@
 """Base checker interface."""
 
 from abc import ABC, abstractmethod
+from typing import Optional
 
+from checkers.document_index import DocumentIndex
 from src.schemas.models import Document, Finding
 
 
@@ -9,8 +11,16 @@ class BaseChecker(ABC):
     """Base class for all checkers."""
 
     @abstractmethod
-    def check(self, document: Document) -> list[Finding]:
-        """Run checks and return findings."""
+    def check(
+        self, document: Document, index: Optional[DocumentIndex] = None
+    ) -> list[Finding]:
+        """
+        Run checks and return findings.
+
+        Args:
+            document: Document to check
+            index: Prebuilt DocumentIndex shared between checkers (built on demand if None)
+        """
         pass
 
     @property
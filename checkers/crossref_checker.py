@@ -4,7 +4,26 @@ import re
 from typing import Optional
 
 from checkers.base import BaseChecker
-from src.schemas.models import Block, Document, Finding, Severity, XRefCheck
+from checkers.document_index import DocumentIndex
+from src.schemas.models import Document, Finding, Severity, XRefCheck
+
+# Note references, in reporting order. A reference like "ks. liite 5" matches
+# both the "liite" and "ks. liite" patterns, and each match is reported.
+_REF_PATTERNS = (
+    # Finnish patterns
+    re.compile(r"liite\s*(\d+)"),
+    re.compile(r"liitetieto\s*(\d+)"),
+    re.compile(r"ks\.\s*liite\s*(\d+)"),  # "ks. liite" = "see note"
+    # English patterns
+    re.compile(r"note\s*(\d+)"),
+    re.compile(r"see\s+note\s*(\d+)"),
+)
+
+# Note headers in notes section: "5. Something" at the start of the block,
+# or "Liite 5", "Liitetieto 5", "Note 5" anywhere
+_NOTE_HEADER_RE = re.compile(
+    r"(?:^(\d+)\.|(?:liite(?:tieto)?|note)\s*(\d+))", re.IGNORECASE
+)
 
 
 class CrossRefChecker(BaseChecker):
@@ -29,77 +48,52 @@ class CrossRefChecker(BaseChecker):
         """
         references: list[tuple[str, int]] = []
         
-        # Finnish patterns
-        finnish_patterns = [
-            r"liite\s*(\d+)",
-            r"liitetieto\s*(\d+)",
-            r"ks\.\s*liite\s*(\d+)",  # "ks. liite" = "see note"
-        ]
-        
-        # English patterns
-        english_patterns = [
-            r"note\s*(\d+)",
-            r"see\s+note\s*(\d+)",
-        ]
-        
         text_lower = text.lower()
         
-        for pattern in finnish_patterns + english_patterns:
-            matches = re.finditer(pattern, text_lower)
-            for match in matches:
-                ref_text = match.group(0)
+        for pattern in _REF_PATTERNS:
+            for match in pattern.finditer(text_lower):
                 try:
-                    note_num = int(match.group(1))
-                    references.append((ref_text, note_num))
+                    references.append((match.group(0), int(match.group(1))))
                 except ValueError:
                     continue
         
         return references
 
-    def find_notes_section_numbers(self, document: Document) -> set[int]:
+    def find_notes_section_numbers(
+        self, document: Document, index: Optional[DocumentIndex] = None
+    ) -> set[int]:
         """
         Find all note numbers that exist in the notes section.
         
         Returns:
             Set of note numbers found
         """
+        if index is None:
+            index = DocumentIndex.from_document(document)
+        
         note_numbers: set[int] = set()
         
-        for page in document.pages:
-            # Only check pages in notes section
-            if page.semantic_section != "notes":
-                continue
-            
-            for item in page.items:
-                if isinstance(item, Block):
-                    text = item.text.lower()
-                    
-                    # Look for note headers (e.g., "Liite 5" or "5. Liitetiedot")
-                    # Pattern: standalone number at start of line or after "Liite"
-                    patterns = [
-                        r"^(\d+)\.",  # "5. Something"
-                        r"liite\s*(\d+)",
-                        r"liitetieto\s*(\d+)",
-                        r"note\s*(\d+)",
-                    ]
-                    
-                    for pattern in patterns:
-                        matches = re.finditer(pattern, text)
-                        for match in matches:
-                            try:
-                                note_num = int(match.group(1))
-                                note_numbers.add(note_num)
-                            except ValueError:
-                                continue
+        # Only check blocks on pages in notes section
+        for _page, block in index.blocks_by_section.get("notes", []):
+            # Look for note headers (e.g., "Liite 5" or "5. Liitetiedot")
+            # Exactly one alternative participates, so lastindex is its group
+            note_numbers.update(
+                int(match[match.lastindex]) for match in _NOTE_HEADER_RE.finditer(block.text)
+            )
         
         return note_numbers
 
-    def check(self, document: Document) -> list[Finding]:
+    def check(
+        self, document: Document, index: Optional[DocumentIndex] = None
+    ) -> list[Finding]:
         """Check that all cross-references have corresponding notes."""
         findings: list[Finding] = []
         
+        if index is None:
+            index = DocumentIndex.from_document(document)
+        
         # Find all note numbers in notes section
-        existing_notes = self.find_notes_section_numbers(document)
+        existing_notes = self.find_notes_section_numbers(document, index)
         
         if not existing_notes:
             # No notes section found, skip cross-reference check
@@ -114,37 +108,36 @@ class CrossRefChecker(BaseChecker):
             return findings
         
         # Collect all references from non-notes sections
-        all_references: dict[int, list[tuple[int, str]]] = {}  # note_num -> [(page_idx, ref_text)]
+        # note_num -> (first_page_idx, first_ref_text, count)
+        all_references: dict[int, tuple[int, str, int]] = {}
         
-        for page in document.pages:
+        for page, block in index.blocks:
             # Skip notes section (references within notes are fine)
             if page.semantic_section == "notes":
                 continue
             
-            for item in page.items:
-                if isinstance(item, Block):
-                    refs = self.extract_references(item.text)
-                    for ref_text, note_num in refs:
-                        if note_num not in all_references:
-                            all_references[note_num] = []
-                        all_references[note_num].append((page.page_index, ref_text))
+            for ref_text, note_num in self.extract_references(block.text):
+                seen = all_references.get(note_num)
+                if seen is None:
+                    all_references[note_num] = (page.page_index, ref_text, 1)
+                else:
+                    all_references[note_num] = (seen[0], seen[1], seen[2] + 1)
         
         # Check each reference
         missing_notes: set[int] = set()
         
-        for note_num, refs in all_references.items():
+        for note_num, (first_page, first_ref, ref_count) in all_references.items():
             if note_num not in existing_notes:
                 missing_notes.add(note_num)
                 
                 # Report first occurrence
-                first_page, first_ref = refs[0]
                 findings.append(
                     Finding(
                         checker=self.name,
                         page_index=first_page,
                         reason=(
                             f"Cross-reference '{first_ref}' (note {note_num}) not found in notes section. "
-                            f"Referenced {len(refs)} time(s) in document."
+                            f"Referenced {ref_count} time(s) in document."
                         ),
                         severity=Severity.WARNING,
                     )
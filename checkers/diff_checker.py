@@ -1,11 +1,14 @@
 """Diff/regression checker (V8 Gate D)."""
 
-import json
 import logging
+from collections import Counter
 from pathlib import Path
 from typing import Any, Optional
 
+import orjson
+
 from checkers.base import BaseChecker
+from checkers.document_index import DocumentIndex
 from src.schemas.models import DiffCheck, Document, Finding, Severity
 
 logger = logging.getLogger(__name__)
@@ -42,40 +45,52 @@ class DiffChecker(BaseChecker):
             return None
         
         try:
-            with open(self.golden_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return orjson.loads(self.golden_path.read_bytes())
         except Exception as e:
             logger.warning(f"Failed to load golden file: {e}")
             return None
 
-    def count_items_per_page(self, doc_dict: dict[str, Any]) -> dict[int, int]:
+    def count_items_per_page(self, doc: Document | dict[str, Any]) -> dict[int, int]:
         """Count items per page."""
+        if isinstance(doc, Document):
+            return {page.page_index: len(page.items) for page in doc.pages}
+        
         counts: dict[int, int] = {}
-        for page in doc_dict.get("pages", []):
+        for page in doc.get("pages", []):
             page_idx = page.get("page_index", 0)
             counts[page_idx] = len(page.get("items", []))
         return counts
 
-    def count_financial_types(self, doc_dict: dict[str, Any]) -> dict[str, int]:
+    def count_financial_types(self, doc: Document | dict[str, Any]) -> dict[str, int]:
         """Count financial types across document."""
-        counts: dict[str, int] = {}
-        for page in doc_dict.get("pages", []):
-            for item in page.get("items", []):
-                ft = item.get("financial_type")
-                if ft:
-                    counts[ft] = counts.get(ft, 0) + 1
-        return counts
+        if isinstance(doc, Document):
+            counts = Counter(
+                item.financial_type.value
+                for page in doc.pages
+                for item in page.items
+                if item.financial_type
+            )
+        else:
+            counts = Counter(
+                item["financial_type"]
+                for page in doc.get("pages", [])
+                for item in page.get("items", [])
+                if item.get("financial_type")
+            )
+        return dict(counts)
 
-    def summarize_ocr_quality(self, doc_dict: dict[str, Any]) -> dict[str, int]:
+    def summarize_ocr_quality(self, doc: Document | dict[str, Any]) -> dict[str, int]:
         """Summarize OCR quality status counts."""
-        counts: dict[str, int] = {}
-        for page in doc_dict.get("pages", []):
-            quality = page.get("ocr_quality", {})
-            status = quality.get("status", "unknown")
-            counts[status] = counts.get(status, 0) + 1
-        return counts
+        if isinstance(doc, Document):
+            qualities = (page.ocr_quality or {} for page in doc.pages)
+        else:
+            qualities = (page.get("ocr_quality") or {} for page in doc.get("pages", []))
+        
+        return dict(Counter(quality.get("status", "unknown") for quality in qualities))
 
-    def check(self, document: Document) -> list[Finding]:
+    def check(
+        self, document: Document, index: Optional[DocumentIndex] = None
+    ) -> list[Finding]:
         """Check document against golden for regression."""
         findings: list[Finding] = []
         
@@ -93,15 +108,14 @@ class DiffChecker(BaseChecker):
             )
             return findings
         
-        # Convert current document to dict for comparison
-        current = document.model_dump()
-        
         # Compare item counts
-        current_counts = self.count_items_per_page(current)
+        current_counts = self.count_items_per_page(document)
         golden_counts = self.count_items_per_page(golden)
         
         item_diffs: list[tuple[int, int, int]] = []  # (page, current, golden)
-        for page_idx in set(current_counts.keys()) | set(golden_counts.keys()):
+        # Page indices are small non-negative ints, so walk the range instead of a key union
+        max_page = max(max(current_counts, default=-1), max(golden_counts, default=-1))
+        for page_idx in range(max_page + 1):
             curr = current_counts.get(page_idx, 0)
             gold = golden_counts.get(page_idx, 0)
             if curr != gold:
@@ -122,7 +136,7 @@ class DiffChecker(BaseChecker):
             )
         
         # Compare financial types
-        current_ft = self.count_financial_types(current)
+        current_ft = self.count_financial_types(document)
         golden_ft = self.count_financial_types(golden)
         
         if current_ft != golden_ft:
@@ -139,7 +153,7 @@ class DiffChecker(BaseChecker):
             )
         
         # Compare OCR quality summary
-        current_ocr = self.summarize_ocr_quality(current)
+        current_ocr = self.summarize_ocr_quality(document)
         golden_ocr = self.summarize_ocr_quality(golden)
         
         if current_ocr != golden_ocr:
@@ -156,7 +170,7 @@ class DiffChecker(BaseChecker):
             )
         
         # Summary finding
-        total_pages = len(current.get("pages", []))
+        total_pages = len(document.pages)
         golden_pages = len(golden.get("pages", []))
         
         findings.append(
@@ -184,7 +198,8 @@ def save_golden(document: Document, output_path: Path) -> None:
     """
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(document.model_dump_json(indent=2))
+    # Compact JSON: golden files are machine-loaded, and pydantic-core serializes
+    # straight to JSON without an intermediate dict tree
+    output_path.write_text(document.model_dump_json(), encoding="utf-8")
     
     logger.info(f"Saved golden document to {output_path}")
@@ -0,0 +1,53 @@
+"""Shared per-document index for checkers."""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from src.schemas.models import Block, Document, FinancialType, Page, Table
+
+
+@dataclass
+class DocumentIndex:
+    """
+    Page/item lookups built in a single pass over a document.
+
+    Built once by the QA runner and shared by all checkers, so each checker
+    iterates only the subset it needs instead of re-walking every page.
+    """
+
+    pages_by_section: dict[Optional[str], list[Page]] = field(default_factory=dict)
+    blocks: list[tuple[Page, Block]] = field(default_factory=list)  # In page order
+    blocks_by_section: dict[Optional[str], list[tuple[Page, Block]]] = field(default_factory=dict)
+    tables: list[tuple[Page, Table]] = field(default_factory=list)
+    balance_sheet_tables: list[tuple[Page, Table]] = field(default_factory=list)
+
+    @classmethod
+    def from_document(cls, document: Document) -> "DocumentIndex":
+        """Build index from document."""
+        pages_by_section: defaultdict[Optional[str], list[Page]] = defaultdict(list)
+        blocks: list[tuple[Page, Block]] = []
+        blocks_by_section: defaultdict[Optional[str], list[tuple[Page, Block]]] = defaultdict(list)
+        tables: list[tuple[Page, Table]] = []
+        balance_sheet_tables: list[tuple[Page, Table]] = []
+
+        for page in document.pages:
+            section = page.semantic_section
+            pages_by_section[section].append(page)
+
+            for item in page.items:
+                if isinstance(item, Table):
+                    tables.append((page, item))
+                    if item.financial_type == FinancialType.BALANCE_SHEET:
+                        balance_sheet_tables.append((page, item))
+                else:
+                    blocks.append((page, item))
+                    blocks_by_section[section].append((page, item))
+
+        return cls(
+            pages_by_section=dict(pages_by_section),
+            blocks=blocks,
+            blocks_by_section=dict(blocks_by_section),
+            tables=tables,
+            balance_sheet_tables=balance_sheet_tables,
+        )
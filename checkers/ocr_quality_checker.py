@@ -1,6 +1,9 @@
 """OCR quality checker (V7 Gate D)."""
 
+from typing import Optional
+
 from checkers.base import BaseChecker
+from checkers.document_index import DocumentIndex
 from src.schemas.models import Document, Finding, Severity
 
 
@@ -12,23 +15,27 @@ class OCRQualityChecker(BaseChecker):
         """Checker name."""
         return "OCRQualityChecker"
 
-    def check(self, document: Document) -> list[Finding]:
+    def check(
+        self, document: Document, index: Optional[DocumentIndex] = None
+    ) -> list[Finding]:
         """Check OCR quality."""
         findings: list[Finding] = []
 
-        # Collect pages with bad OCR quality
+        # Collect pages with bad OCR quality and pages with high repeat_run_max (noise)
         bad_pages: list[tuple[int, float]] = []
+        high_noise_pages: list[tuple[int, int]] = []
         
         for page in document.pages:
-            # Check if page has ocr_quality attribute (V7)
-            if hasattr(page, "ocr_quality") and page.ocr_quality:
-                quality = page.ocr_quality
-                if isinstance(quality, dict):
-                    status = quality.get("status", "unknown")
-                    score = quality.get("score", 0.0)
-                    
-                    if status == "bad":
-                        bad_pages.append((page.page_index, score))
+            quality = page.ocr_quality
+            if not quality:
+                continue
+            
+            if quality.get("status", "unknown") == "bad":
+                bad_pages.append((page.page_index, quality.get("score", 0.0)))
+            
+            repeat_run = quality.get("repeat_run_max", 0)
+            if repeat_run >= 10:
+                high_noise_pages.append((page.page_index, repeat_run))
 
         # Report bad pages
         if bad_pages:
@@ -45,16 +52,6 @@ class OCRQualityChecker(BaseChecker):
                 )
             )
 
-        # Check for pages with high repeat_run_max (noise)
-        high_noise_pages: list[tuple[int, int]] = []
-        for page in document.pages:
-            if hasattr(page, "ocr_quality") and page.ocr_quality:
-                quality = page.ocr_quality
-                if isinstance(quality, dict):
-                    repeat_run = quality.get("repeat_run_max", 0)
-                    if repeat_run >= 10:
-                        high_noise_pages.append((page.page_index, repeat_run))
-
         if high_noise_pages:
             findings.append(
                 Finding(
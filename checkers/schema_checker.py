@@ -1,6 +1,9 @@
 """Schema validation checker."""
 
+from typing import Optional
+
 from checkers.base import BaseChecker
+from checkers.document_index import DocumentIndex
 from src.schemas.models import Document, Finding, Severity
 
 
@@ -12,7 +15,9 @@ class SchemaChecker(BaseChecker):
         """Checker name."""
         return "SchemaChecker"
 
-    def check(self, document: Document) -> list[Finding]:
+    def check(
+        self, document: Document, index: Optional[DocumentIndex] = None
+    ) -> list[Finding]:
         """Validate document schema."""
         findings: list[Finding] = []
 
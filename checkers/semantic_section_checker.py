@@ -1,8 +1,15 @@
 """Semantic section checker (V7 Gate D)."""
 
+from typing import Optional
+
 from checkers.base import BaseChecker
+from checkers.document_index import DocumentIndex
 from src.schemas.models import Document, Finding, Severity
 
+# Required sections for mini-runs (3-5 pages) and full runs
+_MINI_REQUIRED = frozenset({"cover", "toc"})
+_FULL_REQUIRED = frozenset({"income_statement", "balance_sheet"})
+
 
 class SemanticSectionChecker(BaseChecker):
     """Checks that required semantic sections are present."""
@@ -12,22 +19,24 @@ class SemanticSectionChecker(BaseChecker):
         """Checker name."""
         return "SemanticSectionChecker"
 
-    def check(self, document: Document) -> list[Finding]:
+    def check(
+        self, document: Document, index: Optional[DocumentIndex] = None
+    ) -> list[Finding]:
         """Check semantic sections."""
         findings: list[Finding] = []
 
-        # Collect semantic sections
-        semantic_sections = set()
-        for page in document.pages:
-            if page.semantic_section:
-                semantic_sections.add(page.semantic_section)
+        if index is None:
+            index = DocumentIndex.from_document(document)
+        
+        # Collect semantic sections (index keys are already unique)
+        semantic_sections = {section for section in index.pages_by_section if section}
 
         total_pages = len(document.pages)
 
         # V7: Mini-run requirements (3-5 pages)
         if total_pages <= 5:
             # Require at least cover and toc
-            required_sections = {"cover", "toc"}
+            required_sections = _MINI_REQUIRED
             missing = required_sections - semantic_sections
 
             if missing:
@@ -35,13 +44,13 @@ class SemanticSectionChecker(BaseChecker):
                     Finding(
                         checker=self.name,
                         page_index=0,
-                        reason=f"Mini-run missing required sections: {missing}. Found: {semantic_sections}",
+                        reason=f"Mini-run missing required sections: {set(missing)}. Found: {semantic_sections}",
                         severity=Severity.WARNING,
                     )
                 )
         else:
             # Full-run requirements
-            required_sections = {"income_statement", "balance_sheet"}
+            required_sections = _FULL_REQUIRED
             missing = required_sections - semantic_sections
 
             if missing:
@@ -49,7 +58,7 @@ class SemanticSectionChecker(BaseChecker):
                     Finding(
                         checker=self.name,
                         page_index=0,
-                        reason=f"Full-run missing required sections: {missing}. Found: {semantic_sections}",
+                        reason=f"Full-run missing required sections: {set(missing)}. Found: {semantic_sections}",
                         severity=Severity.WARNING,
                     )
                 )
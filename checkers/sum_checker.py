@@ -1,9 +1,20 @@
 """Sum consistency checker."""
 
+import math
 import re
+from collections import defaultdict
+from typing import Optional
 
 from checkers.base import BaseChecker
-from src.schemas.models import Document, Finding, Severity, SumCheck, Table
+from checkers.document_index import DocumentIndex
+from src.schemas.models import Cell, Document, Finding, Severity, SumCheck
+
+# Number cleanup: drop spaces/units, decimal comma -> dot
+_NUM_STRIP = str.maketrans({" ": None, "€": None, "%": None, ",": "."})
+_NUM_RE = re.compile(r"-?\d+\.?\d*")
+
+# Sum rows (heuristic: rows labelled "YHTEENSÄ", "TOTAL", etc.)
+_SUM_KW_RE = re.compile(r"yhteensä|total|sum|kokonaismäärä", re.IGNORECASE)
 
 
 class SumChecker(BaseChecker):
@@ -20,7 +31,7 @@ class SumChecker(BaseChecker):
             return None
 
         # Remove common formatting
-        text = text.strip().replace(" ", "").replace(",", ".").replace("€", "").replace("%", "")
+        text = text.strip().translate(_NUM_STRIP)
 
         # Handle parentheses as negative
         is_negative = text.startswith("(") and text.endswith(")")
@@ -28,7 +39,7 @@ class SumChecker(BaseChecker):
             text = text[1:-1]
 
         # Extract number
-        match = re.search(r"-?\d+\.?\d*", text)
+        match = _NUM_RE.search(text)
         if match:
             try:
                 value = float(match.group())
@@ -38,60 +49,56 @@ class SumChecker(BaseChecker):
 
         return None
 
-    def check(self, document: Document) -> list[Finding]:
+    def check(
+        self, document: Document, index: Optional[DocumentIndex] = None
+    ) -> list[Finding]:
         """Check sum consistency."""
         findings: list[Finding] = []
 
-        for page in document.pages:
-            for item in page.items:
-                if not isinstance(item, Table):
-                    continue
-
-                # This is a Table
-                table = item
-                if not table.cells:
-                    continue
-
-                # Find sum rows (heuristic: rows with "YHTEENSÄ", "TOTAL", etc.)
-                sum_keywords = ["yhteensä", "total", "sum", "kokonaismäärä"]
-
-                # Group cells by row
-                rows: dict[int, list] = {}
-                for cell in table.cells:
-                    if cell.row not in rows:
-                        rows[cell.row] = []
-                    rows[cell.row].append(cell)
-
-                # Check each row
-                for row_idx, row_cells in rows.items():
-                    # Check if this is a sum row
-                    first_cell_text = row_cells[0].text_raw.lower() if row_cells else ""
-                    is_sum_row = any(keyword in first_cell_text for keyword in sum_keywords)
-
-                    if is_sum_row:
-                        # Try to find expected sum from other cells in row
-                        numeric_values = []
-                        for cell in row_cells[1:]:  # Skip first (label)
+        if index is None:
+            index = DocumentIndex.from_document(document)
+
+        for page, table in index.tables:
+            if not table.cells:
+                continue
+
+            # Group cells by row
+            rows: defaultdict[int, list[Cell]] = defaultdict(list)
+            for cell in table.cells:
+                rows[cell.row].append(cell)
+
+            # Check each row
+            for row_idx, row_cells in rows.items():
+                # Check if this is a sum row
+                is_sum_row = bool(row_cells) and _SUM_KW_RE.search(row_cells[0].text_raw) is not None
+
+                if is_sum_row:
+                    # Try to find expected sum from other cells in row
+                    numeric_values = []
+                    for cell in row_cells[1:]:  # Skip first (label)
+                        # value_num is pre-parsed by step 60 normalize
+                        value = cell.value_num
+                        if value is None:
                             value = self.parse_number(cell.text_raw)
-                            if value is not None:
-                                numeric_values.append(value)
-
-                        if len(numeric_values) >= 2:
-                            # Compare values (simple heuristic: last value should equal sum of others)
-                            expected = sum(numeric_values[:-1])
-                            actual = numeric_values[-1]
-                            difference = abs(expected - actual)
-
-                            # Allow small rounding differences
-                            if difference > 0.01:
-                                findings.append(
-                                    Finding(
-                                        checker=self.name,
-                                        page_index=page.page_index,
-                                        table_id=table.table_id,
-                                        reason=f"Sum mismatch in row {row_idx}: expected {expected}, got {actual}",
-                                        severity=Severity.WARNING,
-                                    )
+                        if value is not None:
+                            numeric_values.append(value)
+
+                    if len(numeric_values) >= 2:
+                        # Compare values (simple heuristic: last value should equal sum of others)
+                        expected = math.fsum(numeric_values[:-1])  # exact, no drift on long rows
+                        actual = numeric_values[-1]
+                        difference = abs(expected - actual)
+
+                        # Allow small rounding differences
+                        if difference > 0.01:
+                            findings.append(
+                                Finding(
+                                    checker=self.name,
+                                    page_index=page.page_index,
+                                    table_id=table.table_id,
+                                    reason=f"Sum mismatch in row {row_idx}: expected {expected}, got {actual}",
+                                    severity=Severity.WARNING,
                                 )
+                            )
 
         return findings
@@ -1,16 +1,18 @@
 """Music sheet processing module."""
 
-from src.music.detect import is_music_sheet, detect_staff_lines
+from src.music.detect import is_music_sheet, detect_staff_lines, detect_music_sheets_batch
 from src.music.extract import extract_music_metadata, process_music_sheet
-from src.music.omr import run_audiveris, find_audiveris, OMRResult
+from src.music.omr import run_audiveris, run_audiveris_batch, find_audiveris, OMRResult
 from src.music.preflight import run_preflight, PreflightResult
 
 __all__ = [
     "is_music_sheet", 
     "detect_staff_lines", 
+    "detect_music_sheets_batch",
     "extract_music_metadata",
     "process_music_sheet",
     "run_audiveris",
+    "run_audiveris_batch",
     "find_audiveris",
     "OMRResult",
     "run_preflight",
@@ -1,23 +1,34 @@
 """Music sheet metadata extraction using OCR."""
 
+import functools
+import hashlib
 import logging
 import re
+import tempfile
+import threading
+from collections import OrderedDict, defaultdict
 from pathlib import Path
 from typing import Any
 
 import cv2
 import numpy as np
+from pydantic import TypeAdapter
 
 from src.schemas.models import MusicMetadata, Block, BlockType, BBox, SourceType
 
 logger = logging.getLogger(__name__)
 
+# Serializes a page's blocks in one call instead of model_dump() per block
+_BLOCK_LIST_ADAPTER = TypeAdapter(list[Block])
+
 # Dynamic markings patterns (case-insensitive matching)
 DYNAMICS = [
     "ppp", "pp", "p", "mp", "mf", "f", "ff", "fff",
     "sfz", "sfp", "fp", "rf", "rfz", "fz",
 ]
 
+_DYNAMICS_SET = frozenset(DYNAMICS)
+
 # Expression markings patterns
 EXPRESSIONS = [
     "cresc", "decresc", "dim", "crescendo", "diminuendo",
@@ -32,25 +43,47 @@ EXPRESSIONS = [
     "l.v.", "let vibrate", "in tempo",
 ]
 
+# All expression markings as one alternation: a single scan of the text
+# instead of one substring search per marking
+_EXPRESSIONS_RE = re.compile("|".join(re.escape(expr) for expr in EXPRESSIONS))
+
+# Header line parsing patterns (extract_music_metadata)
+_NON_NAME_CHARS_RE = re.compile(r'[^a-zA-ZäöåÄÖÅ\s\-]')
+_NAME_RE = re.compile(r"[A-ZÄÖÅ][a-zäöå]+\s+[A-ZÄÖÅ][a-zäöå]+")
+_YEAR_RE = re.compile(r"\d{4}")
+_CHAR_PREFIX_RE = re.compile(r'^[a-z]\s+')
+_TRAILING_DIGIT_RE = re.compile(r'\s+\d$')
+
+# Opening kernel for binarized OCR regions (removes speckle left by Otsu)
+_OCR_OPEN_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
+
+# Regions whose median glyph height is at least this many pixels are OCR'd at
+# half resolution: text stays well above Tesseract's useful x-height, with 4x fewer pixels
+_OCR_DOWNSCALE_GLYPH_HEIGHT = 60
+_OCR_MIN_GLYPH_HEIGHT = 8  # Components below this are speckle, not glyphs
+
+# OCR results of recently processed pages, keyed by image digest + staff bounds
+_OCR_CACHE_SIZE = 64
+_ocr_cache: OrderedDict[tuple[Any, ...], list[dict[str, Any]]] = OrderedDict()
+_ocr_cache_lock = threading.Lock()
+
 # Minimum confidence threshold for OCR blocks
 MIN_OCR_CONFIDENCE = 0.55
 
 # Known noise patterns from musical notation OCR
-NOISE_PATTERNS = {
+NOISE_PATTERNS: frozenset[str] = frozenset({
     "fer", "ep", "ef", "eff", "wth", "leap", "ty", "ocr", "or", "op", 
     "of", "oe", "oer", "rer", "ee", "ff", "rr", "tt", "hh",
-}
+})
 
 # Valid music text whitelist (lowercase)
-MUSIC_TEXT_WHITELIST = set(DYNAMICS) | set(EXPRESSIONS) | {
+MUSIC_TEXT_WHITELIST: frozenset[str] = _DYNAMICS_SET | frozenset(EXPRESSIONS) | {
     # Common tempo markings
     "andante", "allegro", "adagio", "presto", "moderato", "largo",
     "lento", "vivace", "grave", "maestoso",
     # Guitar specific
     "cvii", "cvi", "cv", "civ", "ciii", "cii", "ci",  # Capo positions
     "harm", "harmonics", "nat", "natural",
-    # Dynamics extensions  
-    "cresc", "dim", "decresc",
 }
 
 
@@ -66,18 +99,18 @@ def is_valid_music_text(text: str, confidence: float, region: str) -> bool:
     Returns:
         True if text should be kept
     """
-    text_lower = text.lower().strip()
-    
-    # Always reject low confidence
+    # Always reject low confidence (before any string work - most rejects end here)
     if confidence < MIN_OCR_CONFIDENCE:
         return False
     
+    text_lower = text.lower().strip()
+    
     # Reject known noise patterns
     if text_lower in NOISE_PATTERNS:
         return False
     
     # Reject very short tokens that aren't dynamics
-    if len(text_lower) <= 2 and text_lower not in DYNAMICS:
+    if len(text_lower) <= 2 and text_lower not in _DYNAMICS_SET:
         # Allow measure numbers (digits)
         if not text.isdigit():
             return False
@@ -120,6 +153,40 @@ def _is_in_staff_area(y: int, staves: list[dict[str, Any]], margin: int = 30) ->
     return False
 
 
+def _ocr_scale(binary: np.ndarray) -> int:
+    """Return integer downscale factor for a binarized region (1 = keep as is)."""
+    _, _, stats, _ = cv2.connectedComponentsWithStats(cv2.bitwise_not(binary), connectivity=8)
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    heights = heights[heights >= _OCR_MIN_GLYPH_HEIGHT]
+    if heights.size and np.median(heights) >= _OCR_DOWNSCALE_GLYPH_HEIGHT:
+        return 2
+    return 1
+
+
+@functools.cache
+def _load_pytesseract() -> Any:
+    """Import pytesseract and apply the configured tesseract_cmd (once per process)."""
+    import pytesseract
+    from src.pipeline.config import get_settings
+    
+    settings = get_settings()
+    if settings.tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = str(settings.tesseract_cmd)
+    return pytesseract
+
+
+def _copy_text_blocks(text_blocks: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Copy text blocks so cached results are never mutated by callers."""
+    return [{**block, "bbox": dict(block["bbox"])} for block in text_blocks]
+
+
+def _ocr_cache_key(gray: np.ndarray, staves: list[dict[str, Any]]) -> tuple[Any, ...]:
+    """Build OCR cache key from grayscale pixels and the staff bounds used for regions."""
+    digest = hashlib.blake2b(np.ascontiguousarray(gray).data, digest_size=16).digest()
+    staff_bounds = tuple((staff["top_y"], staff["bottom_y"]) for staff in staves)
+    return digest, gray.shape, staff_bounds
+
+
 def extract_text_regions_ocr(
     image: np.ndarray, staves: list[dict[str, Any]]
 ) -> list[dict[str, Any]]:
@@ -141,13 +208,7 @@ def extract_text_regions_ocr(
         List of text region dicts with bbox and OCR text
     """
     try:
-        import pytesseract
-        from PIL import Image
-        from src.pipeline.config import get_settings
-        
-        settings = get_settings()
-        if settings.tesseract_cmd:
-            pytesseract.pytesseract.tesseract_cmd = str(settings.tesseract_cmd)
+        pytesseract = _load_pytesseract()
     except ImportError:
         logger.error("pytesseract not available")
         return []
@@ -158,6 +219,16 @@ def extract_text_regions_ocr(
     else:
         gray = image.copy()
     
+    # Identical page already OCR'd in this process (reruns, duplicate pages)
+    cache_key = _ocr_cache_key(gray, staves)
+    with _ocr_cache_lock:
+        cached = _ocr_cache.get(cache_key)
+        if cached is not None:
+            _ocr_cache.move_to_end(cache_key)
+    if cached is not None:
+        logger.debug("Music sheet OCR cache hit")
+        return _copy_text_blocks(cached)
+    
     height, width = gray.shape
     
     # Define regions of interest - ONLY areas OUTSIDE staff lines
@@ -218,41 +289,116 @@ def extract_text_regions_ocr(
     # NOTE: We deliberately DO NOT OCR the staff areas themselves
     # This prevents noise like "FER/EP/EF/EFF" from musical notation
     
-    # OCR each region
+    # OCR all regions in a single Tesseract run: crops go to a temp dir and Tesseract
+    # gets an image-list file, so the engine and eng+ita models load once per page
+    # instead of once per region. TSV page_num (1-based) maps rows back to regions.
     text_blocks: list[dict[str, Any]] = []
+    if not regions:
+        return text_blocks
     
-    for region in regions:
-        try:
-            pil_image = Image.fromarray(region["image"])
-            
-            # Use Tesseract with layout analysis
-            data = pytesseract.image_to_data(
-                pil_image,
-                lang="eng+ita",  # Italian for music terms
-                output_type=pytesseract.Output.DICT,
-            )
+    # (TSV data, regions indexed by page_num - 1) per Tesseract run
+    ocr_runs: list[tuple[dict[str, Any], list[dict[str, Any]]]] = []
+    all_regions_read = True
+    
+    try:
+        with tempfile.TemporaryDirectory(prefix="music_ocr_") as tmp_dir:
+            # Crops that made it to disk, and their files (a failed crop only loses itself)
+            ocr_regions: list[dict[str, Any]] = []
+            image_paths: list[str] = []
+            for i, region in enumerate(regions):
+                try:
+                    # Binarize before OCR: Otsu + small opening drops the speckle that
+                    # Tesseract would otherwise return as noise tokens
+                    _, binary = cv2.threshold(
+                        region["image"], 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU
+                    )
+                    binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, _OCR_OPEN_KERNEL)
+                    
+                    # Large type (high-DPI title lines): OCR at reduced resolution
+                    scale = _ocr_scale(binary)
+                    if scale > 1:
+                        h, w = binary.shape
+                        binary = cv2.resize(
+                            binary, (w // scale, h // scale), interpolation=cv2.INTER_AREA
+                        )
+                    region["scale"] = scale
+                    
+                    # Raw PGM: no deflate on write and no inflate when Leptonica reads it
+                    region_path = Path(tmp_dir) / f"region_{i}.pgm"
+                    if not cv2.imwrite(str(region_path), binary):
+                        raise OSError(f"could not write {region_path}")
+                except Exception as e:
+                    logger.warning(f"OCR failed for region {region['name']}: {e}")
+                    all_regions_read = False
+                    continue
+                ocr_regions.append(region)
+                image_paths.append(str(region_path))
             
-            for i, text in enumerate(data["text"]):
-                if text.strip():
-                    x = data["left"][i] + region["x_offset"]
-                    y = data["top"][i] + region["y_offset"]
-                    w = data["width"][i]
-                    h = data["height"][i]
-                    conf = data["conf"][i] / 100.0  # Normalize to 0-1
-                    text_clean = text.strip()
-
-                    # Apply noise filtering
-                    if is_valid_music_text(text_clean, conf, region["name"]):
-                        text_blocks.append({
-                            "text": text_clean,
-                            "bbox": {"x0": x, "y0": y, "x1": x + w, "y1": y + h},
-                            "confidence": conf,
-                            "region": region["name"],
-                        })
-                    else:
-                        logger.debug(f"Filtered noise: '{text_clean}' (conf={conf:.2f}, region={region['name']})")
-        except Exception as e:
-            logger.warning(f"OCR failed for region {region['name']}: {e}")
+            if ocr_regions:
+                list_path = Path(tmp_dir) / "regions.txt"
+                list_path.write_text("\n".join(image_paths) + "\n", encoding="utf-8")
+                
+                try:
+                    # Use Tesseract with layout analysis
+                    data = pytesseract.image_to_data(
+                        str(list_path),
+                        lang="eng+ita",  # Italian for music terms
+                        output_type=pytesseract.Output.DICT,
+                    )
+                    ocr_runs.append((data, ocr_regions))
+                except Exception as e:
+                    # One bad crop fails the whole batch: retry region by region so
+                    # it only costs that region's text
+                    logger.warning(f"Batched OCR failed for music sheet regions, retrying per region: {e}")
+                    for region, region_path in zip(ocr_regions, image_paths):
+                        try:
+                            data = pytesseract.image_to_data(
+                                region_path,
+                                lang="eng+ita",
+                                output_type=pytesseract.Output.DICT,
+                            )
+                        except Exception as e:
+                            logger.warning(f"OCR failed for region {region['name']}: {e}")
+                            all_regions_read = False
+                            continue
+                        ocr_runs.append((data, [region]))
+    except Exception as e:
+        logger.warning(f"OCR failed for music sheet regions: {e}")
+        return text_blocks
+    
+    for data, run_regions in ocr_runs:
+        # Confidence gate on the whole TSV column at once: structural rows (conf -1)
+        # and low-confidence words never reach the per-row Python checks
+        conf_column = np.asarray(data["conf"], dtype=np.float64) / 100.0
+        for i in np.flatnonzero(conf_column >= MIN_OCR_CONFIDENCE).tolist():
+            text_clean = data["text"][i].strip()
+            if not text_clean:
+                continue
+            region = run_regions[int(data["page_num"][i]) - 1]
+            scale = region["scale"]
+            x = data["left"][i] * scale + region["x_offset"]
+            y = data["top"][i] * scale + region["y_offset"]
+            w = data["width"][i] * scale
+            h = data["height"][i] * scale
+            conf = data["conf"][i] / 100.0  # Normalize to 0-1
+
+            # Apply noise filtering
+            if is_valid_music_text(text_clean, conf, region["name"]):
+                text_blocks.append({
+                    "text": text_clean,
+                    "bbox": {"x0": x, "y0": y, "x1": x + w, "y1": y + h},
+                    "confidence": conf,
+                    "region": region["name"],
+                })
+            else:
+                logger.debug(f"Filtered noise: '{text_clean}' (conf={conf:.2f}, region={region['name']})")
+    
+    # Partial results (a region failed) are not cached, so a rerun can retry it
+    if all_regions_read:
+        with _ocr_cache_lock:
+            _ocr_cache[cache_key] = _copy_text_blocks(text_blocks)
+            if len(_ocr_cache) > _OCR_CACHE_SIZE:
+                _ocr_cache.popitem(last=False)
     
     return text_blocks
 
@@ -269,14 +415,12 @@ def classify_music_text(text: str) -> tuple[BlockType, str | None]:
     text_lower = text.lower().strip()
     
     # Check dynamics (case-insensitive, normalize to lowercase)
-    for dyn in DYNAMICS:
-        if text_lower == dyn:
-            return BlockType.MUSIC_DYNAMIC, dyn  # Always lowercase
+    if text_lower in _DYNAMICS_SET:
+        return BlockType.MUSIC_DYNAMIC, text_lower  # Always lowercase
     
     # Check expressions
-    for expr in EXPRESSIONS:
-        if expr in text_lower:
-            return BlockType.MUSIC_EXPRESSION, text.strip()
+    if _EXPRESSIONS_RE.search(text_lower):
+        return BlockType.MUSIC_EXPRESSION, text.strip()
     
     # Check tempo (contains "=" and number, or metronome mark)
     if "=" in text and any(c.isdigit() for c in text):
@@ -308,13 +452,22 @@ def extract_music_metadata(
     """
     metadata = MusicMetadata()
     
-    # Find title (usually largest text in header, centered)
-    header_texts = [t for t in text_blocks if t.get("region") == "header"]
+    # Nothing OCR'd (typical for continuation pages): skip all parsing
+    if not text_blocks:
+        return metadata
     
-    # Sort by y-position (top first)
-    header_texts.sort(key=lambda t: t["bbox"]["y0"])
+    # Partition blocks by region in one pass
+    texts_by_region: defaultdict[str | None, list[dict[str, Any]]] = defaultdict(list)
+    for block in text_blocks:
+        texts_by_region[block.get("region")].append(block)
+    
+    # Find title (usually largest text in header, centered)
+    header_texts = texts_by_region["header"]
     
     if header_texts:
+        # Sort by y-position (top first)
+        header_texts.sort(key=lambda t: t["bbox"]["y0"])
+        
         # Combine nearby text blocks on same line for better parsing
         combined_lines: list[str] = []
         current_line: list[str] = []
@@ -336,7 +489,7 @@ def extract_music_metadata(
         # Finnish music sheets often have: dedication (small), title (large), composer (medium)
         for i, line in enumerate(combined_lines):
             line_lower = line.lower()
-            line_clean = re.sub(r'[^a-zA-ZäöåÄÖÅ\s\-]', '', line).strip()
+            line_clean = _NON_NAME_CHARS_RE.sub('', line).strip()
             
             # Check for dedication patterns
             is_dedication = (
@@ -345,20 +498,20 @@ def extract_music_metadata(
                 "für" in line_lower or
                 "for" in line_lower or
                 # First line with name pattern (e.g., "Kai Niemiselle")
-                (i == 0 and re.search(r"[A-ZÄÖÅ][a-zäöå]+\s+[A-ZÄÖÅ][a-zäöå]+", line_clean))
+                (i == 0 and _NAME_RE.search(line_clean))
             )
             
             if is_dedication and not metadata.dedication:
                 metadata.dedication = line
             # Composer: contains years (1997-2001)
-            elif re.search(r"\d{4}", line):
+            elif _YEAR_RE.search(line):
                 # Clean up OCR artifacts
-                composer_text = re.sub(r'^[a-z]\s+', '', line)  # Remove single char prefix
-                composer_text = re.sub(r'\s+\d$', '', composer_text)  # Remove trailing single digit
+                composer_text = _CHAR_PREFIX_RE.sub('', line)  # Remove single char prefix
+                composer_text = _TRAILING_DIGIT_RE.sub('', composer_text)  # Remove trailing single digit
                 metadata.composer = composer_text.strip()
             # Title: usually short, no years, not a name pattern
             elif not metadata.title:
-                if len(line) < 30 and not re.search(r"\d{4}", line):
+                if len(line) < 30 and not _YEAR_RE.search(line):
                     # Skip if it's already identified as dedication
                     if line != metadata.dedication:
                         metadata.title = line
@@ -374,43 +527,34 @@ def extract_music_metadata(
                         break
     
     # Find copyright (usually in footer)
-    footer_texts = [t for t in text_blocks if t.get("region") == "footer"]
-    for block in footer_texts:
+    for block in texts_by_region["footer"]:
         if "©" in block["text"] or "copyright" in block["text"].lower():
             metadata.copyright = block["text"]
     
-    # Collect dynamics
+    # Collect dynamics, expressions, tempo and measure numbers in one classification pass
     dynamics_found: set[str] = set()
-    for block in text_blocks:
-        block_type, normalized = classify_music_text(block["text"])
-        if block_type == BlockType.MUSIC_DYNAMIC and normalized:
-            dynamics_found.add(normalized)
-    metadata.dynamics = sorted(list(dynamics_found))
-    
-    # Collect expressions
     expressions_found: set[str] = set()
-    for block in text_blocks:
-        block_type, normalized = classify_music_text(block["text"])
-        if block_type == BlockType.MUSIC_EXPRESSION and normalized:
-            expressions_found.add(normalized)
-    metadata.expressions = sorted(list(expressions_found))
-    
-    # Find tempo marking
-    for block in text_blocks:
-        block_type, normalized = classify_music_text(block["text"])
-        if block_type == BlockType.MUSIC_TEMPO and normalized:
-            metadata.tempo = normalized
-            break
-    
-    # Count measures from measure numbers
     measure_nums: list[int] = []
     for block in text_blocks:
         block_type, normalized = classify_music_text(block["text"])
-        if block_type == BlockType.MUSIC_MEASURE_NUM and normalized:
+        if not normalized:
+            continue
+        if block_type == BlockType.MUSIC_DYNAMIC:
+            dynamics_found.add(normalized)
+        elif block_type == BlockType.MUSIC_EXPRESSION:
+            expressions_found.add(normalized)
+        elif block_type == BlockType.MUSIC_TEMPO:
+            # First tempo marking wins
+            if metadata.tempo is None:
+                metadata.tempo = normalized
+        elif block_type == BlockType.MUSIC_MEASURE_NUM:
+            # Count measures from measure numbers
             try:
                 measure_nums.append(int(normalized))
             except ValueError:
                 pass
+    metadata.dynamics = sorted(dynamics_found)
+    metadata.expressions = sorted(expressions_found)
     
     if measure_nums:
         metadata.measure_count = max(measure_nums)
@@ -510,7 +654,7 @@ def process_music_sheet(image_path: Path | str, run_omr: bool = True) -> dict[st
             
             if omr_data.success and omr_data.measures:
                 from src.music.preflight2 import run_preflight2, hints_to_dict
-                from src.music.rhythm_normalize import normalize_rhythm, rhythm_to_dict
+                from src.music.rhythm_normalize import normalize_rhythm_with_validation, rhythm_to_dict
                 
                 # Convert measures to dict format for processing
                 measures_dict = [
@@ -568,8 +712,8 @@ def process_music_sheet(image_path: Path | str, run_omr: bool = True) -> dict[st
                         m_dict["time_signature"] = default_time_sig
                 
                 # Normalize rhythm
-                normalized_measures = normalize_rhythm(measures_dict)
-                rhythm_summary = rhythm_to_dict(normalized_measures)
+                normalized_measures, validations = normalize_rhythm_with_validation(measures_dict)
+                rhythm_summary = rhythm_to_dict(normalized_measures, validations)
                 
                 # Update OMR measures with normalized data
                 for i, m in enumerate(omr_data.measures):
@@ -619,7 +763,7 @@ def process_music_sheet(image_path: Path | str, run_omr: bool = True) -> dict[st
         "confidence": confidence,
         "staff_count": len(staves),
         "metadata": metadata.model_dump(),
-        "blocks": [b.model_dump() for b in blocks],
+        "blocks": _BLOCK_LIST_ADAPTER.dump_python(blocks),
         "detection_info": detection_info,
     }
     
@@ -709,27 +853,30 @@ def run_music_qa(result: dict[str, Any]) -> dict[str, Any]:
                 if status == "pass":
                     status = "warning"
         
-        # QA 7: Check for missing time signatures
+        # QA 7-8: Count measures without time signature and notes without
+        # beat position in a single pass over the measures
         measures = omr.get("measures", [])
-        measures_without_time = [
-            m for m in measures if not m.get("time_signature")
-        ]
+        measures_without_time = 0
+        notes_without_beat = 0
+        for measure in measures:
+            if not measure.get("time_signature"):
+                measures_without_time += 1
+            for note in measure.get("notes", ()):
+                beat = note.get("beat")
+                if beat is None or beat == 0.0:
+                    notes_without_beat += 1
+        
+        # QA 7: Check for missing time signatures
         if measures_without_time:
             findings.append({
                 "check": "time_signature_coverage",
                 "severity": "warning",
-                "message": f"{len(measures_without_time)} measures without time signature"
+                "message": f"{measures_without_time} measures without time signature"
             })
             if status == "pass":
                 status = "warning"
         
         # QA 8: Check for notes without beat positions
-        notes_without_beat = 0
-        for measure in measures:
-            for note in measure.get("notes", []):
-                if note.get("beat") is None or note.get("beat") == 0.0:
-                    notes_without_beat += 1
-        
         if notes_without_beat > len(measures):  # More than 1 per measure average
             findings.append({
                 "check": "beat_positions",
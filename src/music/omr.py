@@ -5,18 +5,38 @@ Supports Audiveris for MusicXML extraction.
 Falls back to staff-detect + OCR when Audiveris is not available.
 """
 
-import json
 import logging
+import shutil
 import subprocess
+import tempfile
 import xml.etree.ElementTree as ET
+import zipfile
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# <alter> value -> accidental in pitch strings (naturals and microtones: none)
+_ALTER_SYMBOLS = {"1": "#", "-1": "b", "2": "x", "-2": "bb"}
+
+# Major key name by circle-of-fifths position, indexed by <fifths> + 7
+_KEY_NAMES = (
+    "Cb", "Gb", "Db", "Ab", "Eb", "Bb", "F",
+    "C", "G", "D", "A", "E", "B", "F#", "C#",
+)
+
+# MusicXML elements read by _parse_score, in the order _qualified_tags returns them
+_MUSICXML_TAGS = (
+    "measure", "part", "note", "pitch", "step", "octave", "alter", "type",
+    "time", "beats", "beat-type", "key", "fifths",
+)
+
 
-@dataclass
+@dataclass(slots=True)
 class Note:
     """A single musical note."""
     pitch: str  # e.g., "C4", "D#5"
@@ -25,7 +45,7 @@ class Note:
     voice: int = 1
     
     
-@dataclass
+@dataclass(slots=True)
 class Measure:
     """A musical measure/bar."""
     number: int
@@ -35,7 +55,7 @@ class Measure:
     tempo: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class OMRResult:
     """Result from OMR processing."""
     success: bool
@@ -48,8 +68,14 @@ class OMRResult:
     musicxml_path: Path | None = None
 
 
+@lru_cache(maxsize=1)
 def find_audiveris() -> Path | None:
-    """Find Audiveris installation."""
+    """
+    Find Audiveris installation.
+    
+    Cached per process; call find_audiveris.cache_clear() after installing
+    Audiveris mid-run.
+    """
     # Common installation paths (both .exe and .bat)
     paths = [
         Path("C:/Program Files/Audiveris/Audiveris.exe"),
@@ -64,20 +90,9 @@ def find_audiveris() -> Path | None:
         if path.exists():
             return path
     
-    # Try PATH
-    try:
-        result = subprocess.run(
-            ["where", "audiveris"], 
-            capture_output=True, 
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            return Path(result.stdout.strip().split('\n')[0])
-    except Exception:
-        pass
-    
-    return None
+    # Try PATH (honours PATHEXT on Windows, like `where`)
+    found = shutil.which("audiveris")
+    return Path(found) if found else None
 
 
 def run_audiveris(image_path: Path, output_dir: Path) -> OMRResult:
@@ -91,25 +106,92 @@ def run_audiveris(image_path: Path, output_dir: Path) -> OMRResult:
     Returns:
         OMRResult with extracted musical data
     """
+    return run_audiveris_batch([image_path], output_dir)[0]
+
+
+def run_audiveris_batch(image_paths: list[Path], output_dir: Path) -> list[OMRResult]:
+    """
+    Run Audiveris OMR on several images in a single batch invocation.
+    
+    Audiveris accepts many inputs per -batch run, so the JVM start-up (several
+    seconds, dominant for small scores) is paid once for all images. Each call
+    exports into a fresh subdirectory of output_dir, so files left over from
+    earlier runs are never picked up.
+    
+    Args:
+        image_paths: Paths to music sheet images
+        output_dir: Directory for output files (shared by all images)
+    
+    Returns:
+        OMRResult per image, in input order
+    """
+    if not image_paths:
+        return []
+    
     audiveris_path = find_audiveris()
     
     if not audiveris_path:
-        return OMRResult(
-            success=False,
-            engine="none",
-            error="Audiveris not found. Install from https://github.com/Audiveris/audiveris"
-        )
+        return [
+            OMRResult(
+                success=False,
+                engine="none",
+                error="Audiveris not found. Install from https://github.com/Audiveris/audiveris"
+            )
+            for _ in image_paths
+        ]
     
-    output_dir.mkdir(parents=True, exist_ok=True)
+    # Audiveris names exports after the input stem, so two inputs with the
+    # same stem would overwrite each other: only the first one is run
+    results: dict[int, OMRResult] = {}
+    batch_indices: list[int] = []
+    stem_owner: dict[str, int] = {}
+    for i, image_path in enumerate(image_paths):
+        owner = stem_owner.setdefault(image_path.stem, i)
+        if owner == i:
+            batch_indices.append(i)
+        else:
+            results[i] = OMRResult(
+                success=False,
+                engine="audiveris",
+                error=(
+                    f"Duplicate input name '{image_path.stem}' in batch "
+                    f"(already used by {image_paths[owner]})"
+                )
+            )
+    
+    batch_paths = [image_paths[i] for i in batch_indices]
+    for i, omr_result in zip(batch_indices, _run_audiveris_once(audiveris_path, batch_paths, output_dir)):
+        results[i] = omr_result
+    
+    return [results[i] for i in range(len(image_paths))]
+
+
+def _run_audiveris_once(
+    audiveris_path: Path, image_paths: list[Path], output_dir: Path
+) -> list[OMRResult]:
+    """
+    Run one Audiveris batch over images with distinct stems.
+    
+    Returns:
+        OMRResult per image, in input order
+    """
+    def failed(error: str) -> list[OMRResult]:
+        return [OMRResult(success=False, engine="audiveris", error=error) for _ in image_paths]
+    
+    # 5 minutes max per image
+    timeout_minutes = 5 * len(image_paths)
     
     try:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        run_dir = Path(tempfile.mkdtemp(prefix="audiveris_", dir=output_dir))
+        
         # Run Audiveris in batch mode
         cmd = [
             str(audiveris_path),
             "-batch",
             "-export",
-            "-output", str(output_dir),
-            str(image_path)
+            "-output", str(run_dir),
+            *(str(image_path) for image_path in image_paths),
         ]
         
         logger.info(f"Running Audiveris: {' '.join(cmd)}")
@@ -118,68 +200,227 @@ def run_audiveris(image_path: Path, output_dir: Path) -> OMRResult:
             cmd,
             capture_output=True,
             text=True,
-            timeout=300  # 5 minutes max
+            timeout=timeout_minutes * 60,
         )
         
         if result.returncode != 0:
             logger.error(f"Audiveris failed: {result.stderr}")
-            return OMRResult(
-                success=False,
-                engine="audiveris",
-                error=f"Audiveris error: {result.stderr[:500]}"
-            )
+            return failed(f"Audiveris error: {result.stderr[:500]}")
+        
+        # Find MusicXML output (Audiveris may create multiple movements)
+        musicxml_paths = list(run_dir.glob("*.mxl")) + list(run_dir.glob("*.musicxml"))
+        outputs_by_image = _group_outputs_by_stem(image_paths, musicxml_paths)
+        logs_by_image = _group_outputs_by_stem(image_paths, list(run_dir.glob("*.log")))
         
-        # Check log file for errors (Audiveris may return 0 even on failure)
-        log_files = list(output_dir.glob("*.log"))
-        if log_files:
-            log_content = log_files[0].read_text(encoding="utf-8", errors="ignore")
-            if "resolution is too low" in log_content or "flagged as invalid" in log_content:
-                logger.warning("Audiveris: Image resolution too low (need 300 DPI)")
-                return OMRResult(
+        results: list[OMRResult] = []
+        for image_path, image_outputs, image_logs in zip(image_paths, outputs_by_image, logs_by_image):
+            # Check log file for errors (Audiveris may return 0 even on failure)
+            if any(_log_reports_low_resolution(log_path) for log_path in image_logs):
+                logger.warning(
+                    f"Audiveris: {image_path.name} resolution too low (need 300 DPI)"
+                )
+                results.append(OMRResult(
                     success=False,
                     engine="audiveris",
                     error="Image resolution too low. Audiveris requires 300 DPI minimum. "
                           "Try scanning at higher resolution."
-                )
+                ))
+                continue
+            
+            if not image_outputs:
+                results.append(OMRResult(
+                    success=False,
+                    engine="audiveris",
+                    error="Audiveris produced no MusicXML output"
+                ))
+                continue
+            
+            # Prefer .mxl
+            musicxml_path = min(image_outputs, key=lambda p: (p.suffix != '.mxl', p.name))
+            results.append(parse_musicxml(musicxml_path))
+        return results
         
-        # Find MusicXML output (Audiveris may create multiple movements)
-        stem = image_path.stem
-        musicxml_paths = list(output_dir.glob(f"{stem}*.mxl")) + \
-                        list(output_dir.glob(f"{stem}*.musicxml")) + \
-                        list(output_dir.glob(f"*.mxl")) + \
-                        list(output_dir.glob(f"*.musicxml"))
+    except subprocess.TimeoutExpired:
+        return failed(f"Audiveris timed out (>{timeout_minutes} minutes)")
+    except Exception as e:
+        return failed(f"Audiveris exception: {str(e)}")
+
+
+def _log_reports_low_resolution(log_path: Path) -> bool:
+    """Check an Audiveris log for the low-resolution / invalid sheet errors."""
+    log_content = log_path.read_text(encoding="utf-8", errors="ignore")
+    return "resolution is too low" in log_content or "flagged as invalid" in log_content
+
+
+def _group_outputs_by_stem(image_paths: list[Path], paths: list[Path]) -> list[list[Path]]:
+    """
+    Assign Audiveris output files (exports, logs) to the images they belong to.
+    
+    Audiveris names its files after the input stem (e.g. "page.mxl",
+    "page.mvt1.mxl"). Each file goes to the longest matching stem, so "page1"
+    does not claim "page10.mxl". With a single image, any file counts; with
+    several, files matching no stem are ignored.
+    
+    Returns:
+        Paths per image, in input order
+    """
+    stems = [image_path.stem for image_path in image_paths]
+    grouped: list[list[Path]] = [[] for _ in image_paths]
+    
+    if len(image_paths) == 1:
+        grouped[0] = list(paths)
+        return grouped
+    
+    for path in paths:
+        owners = [i for i, stem in enumerate(stems) if path.name.startswith(stem)]
+        if owners:
+            grouped[max(owners, key=lambda i: len(stems[i]))].append(path)
+    
+    return grouped
+
+
+@lru_cache(maxsize=8)
+def _qualified_tags(namespace: str) -> tuple[str, ...]:
+    """Return _MUSICXML_TAGS qualified with a namespace URI (plain if empty)."""
+    if not namespace:
+        return _MUSICXML_TAGS
+    return tuple(f"{{{namespace}}}{tag}" for tag in _MUSICXML_TAGS)
+
+
+def _parse_score(
+    source: Any,
+) -> tuple[list[Measure], str | None, str | None]:
+    """
+    Stream a MusicXML document measure by measure.
+    
+    Uses iterparse "end" events so only the measure being parsed is kept in
+    memory: notes, time and key are collected as their elements close, and the
+    <measure> element is cleared once turned into a Measure. Tag names are
+    qualified once from the document's default namespace (if any) and then
+    compared and looked up as plain strings.
+    
+    Args:
+        source: File path or binary file object
+    
+    Returns:
+        Tuple of (measures, first time signature, first key signature)
+    """
+    measures: list[Measure] = []
+    time_sig: str | None = None
+    key_sig: str | None = None
+    
+    # Pending content of the measure being parsed
+    notes: list[Note] = []
+    measure_time: str | None = None
+    measure_key: str | None = None
+    time_seen = False
+    key_seen = False
+    
+    (
+        measure_tag, part_tag, note_tag, pitch_tag, step_tag, octave_tag, alter_tag,
+        type_tag, time_tag, beats_tag, beat_type_tag, key_tag, fifths_tag,
+    ) = _qualified_tags("")
+    
+    for event, item in ET.iterparse(source, events=("start-ns", "end")):
+        if event == "start-ns":
+            prefix, uri = item
+            if not prefix:
+                (
+                    measure_tag, part_tag, note_tag, pitch_tag, step_tag, octave_tag, alter_tag,
+                    type_tag, time_tag, beats_tag, beat_type_tag, key_tag, fifths_tag,
+                ) = _qualified_tags(uri)
+            continue
         
-        # Remove duplicates and prefer .mxl
-        seen = set()
-        unique_paths = []
-        for p in musicxml_paths:
-            if p.name not in seen:
-                seen.add(p.name)
-                unique_paths.append(p)
-        musicxml_paths = sorted(unique_paths, key=lambda p: (p.suffix != '.mxl', p.name))
+        elem = item
+        tag = elem.tag
         
-        if not musicxml_paths:
-            return OMRResult(
-                success=False,
-                engine="audiveris",
-                error="Audiveris produced no MusicXML output"
-            )
+        if tag == note_tag:
+            pitch_elem = elem.find(pitch_tag)
+            if pitch_elem is not None:
+                step = pitch_elem.findtext(step_tag, '')
+                octave = pitch_elem.findtext(octave_tag, '')
+                alter = pitch_elem.findtext(alter_tag, '')
+                
+                # Build pitch string
+                pitch = f"{step}{_ALTER_SYMBOLS.get(alter, '')}{octave}"
+                
+                # Get duration type
+                duration_type = elem.findtext(type_tag, 'quarter')
+                
+                notes.append(Note(
+                    pitch=pitch,
+                    duration=duration_type,
+                    beat=1.0,  # TODO: Calculate from position
+                ))
         
-        musicxml_path = musicxml_paths[0]
-        return parse_musicxml(musicxml_path)
+        # Extract time signature (first <time> of the measure)
+        elif tag == time_tag and not time_seen:
+            time_seen = True
+            beats = elem.findtext(beats_tag, '')
+            beat_type = elem.findtext(beat_type_tag, '')
+            if beats and beat_type:
+                measure_time = f"{beats}/{beat_type}"
+                if not time_sig:
+                    time_sig = measure_time
         
-    except subprocess.TimeoutExpired:
-        return OMRResult(
-            success=False,
-            engine="audiveris",
-            error="Audiveris timed out (>5 minutes)"
-        )
-    except Exception as e:
-        return OMRResult(
-            success=False,
-            engine="audiveris",
-            error=f"Audiveris exception: {str(e)}"
-        )
+        # Extract key signature (first <key> of the measure)
+        elif tag == key_tag and not key_seen:
+            key_seen = True
+            fifths_int = int(elem.findtext(fifths_tag, '0'))
+            if -7 <= fifths_int <= 7:
+                measure_key = _KEY_NAMES[fifths_int + 7]
+            else:
+                measure_key = "C"
+            if not key_sig:
+                key_sig = measure_key
+        
+        elif tag == measure_tag:
+            measure_num = int(elem.get('number', 0))
+            if notes or measure_time or measure_key:
+                measures.append(Measure(
+                    number=measure_num,
+                    notes=notes,
+                    time_signature=measure_time,
+                    key_signature=measure_key,
+                ))
+            notes = []
+            measure_time = None
+            measure_key = None
+            time_seen = False
+            key_seen = False
+            elem.clear()
+        
+        elif tag == part_tag:
+            elem.clear()
+    
+    return measures, time_sig, key_sig
+
+
+def _find_mxl_rootfile(zf: zipfile.ZipFile) -> str | None:
+    """
+    Find the score file inside a compressed MusicXML (.mxl) archive.
+    
+    Reads the rootfile declared in META-INF/container.xml; archives without a
+    usable container fall back to the first non-container .xml entry.
+    """
+    names = zf.namelist()
+    
+    if "META-INF/container.xml" in names:
+        with zf.open("META-INF/container.xml") as container_file:
+            rootfile = ET.parse(container_file).getroot().find(".//{*}rootfile")
+        full_path = rootfile.get("full-path") if rootfile is not None else None
+        if full_path in names:
+            return full_path
+    
+    # Find the main XML file in the archive
+    xml_files = [f for f in names
+                 if f.endswith('.xml') and not f.startswith('META-INF')]
+    
+    # Prefer root file over container.xml
+    for f in xml_files:
+        if 'container' not in f.lower():
+            return f
+    return xml_files[0] if xml_files else None
 
 
 def parse_musicxml(path: Path) -> OMRResult:
@@ -194,17 +435,13 @@ def parse_musicxml(path: Path) -> OMRResult:
     Returns:
         OMRResult with parsed data
     """
-    import zipfile
-    
     try:
         # Handle compressed MusicXML (.mxl)
         if path.suffix.lower() == ".mxl":
             with zipfile.ZipFile(path, 'r') as zf:
-                # Find the main XML file in the archive
-                xml_files = [f for f in zf.namelist() 
-                            if f.endswith('.xml') and not f.startswith('META-INF')]
+                main_file = _find_mxl_rootfile(zf)
                 
-                if not xml_files:
+                if main_file is None:
                     return OMRResult(
                         success=False,
                         engine="audiveris",
@@ -212,87 +449,13 @@ def parse_musicxml(path: Path) -> OMRResult:
                         musicxml_path=path,
                     )
                 
-                # Prefer container.xml or root file
-                main_file = xml_files[0]
-                for f in xml_files:
-                    if 'container' not in f.lower():
-                        main_file = f
-                        break
-                
                 with zf.open(main_file) as xml_file:
-                    tree = ET.parse(xml_file)
-                    root = tree.getroot()
+                    measures, time_sig, key_sig = _parse_score(xml_file)
         else:
-            tree = ET.parse(path)
-            root = tree.getroot()
-        
-        # Handle namespace
-        ns = {'': 'http://www.musicxml.org/xsd/3.1'} if root.tag.startswith('{') else {}
+            measures, time_sig, key_sig = _parse_score(path)
         
-        measures: list[Measure] = []
-        time_sig: str | None = None
-        key_sig: str | None = None
         tempo: str | None = None
         
-        # Find all measures
-        for part in root.findall('.//part', ns) or root.findall('.//part'):
-            for measure_elem in part.findall('.//measure', ns) or part.findall('.//measure'):
-                measure_num = int(measure_elem.get('number', 0))
-                measure = Measure(number=measure_num)
-                
-                # Extract notes
-                for note_elem in measure_elem.findall('.//note', ns) or measure_elem.findall('.//note'):
-                    pitch_elem = note_elem.find('.//pitch', ns) or note_elem.find('.//pitch')
-                    if pitch_elem is not None:
-                        step = pitch_elem.findtext('step', '', ns) or pitch_elem.findtext('step', '')
-                        octave = pitch_elem.findtext('octave', '', ns) or pitch_elem.findtext('octave', '')
-                        alter = pitch_elem.findtext('alter', '', ns) or pitch_elem.findtext('alter', '')
-                        
-                        # Build pitch string
-                        pitch = step
-                        if alter == '1':
-                            pitch += '#'
-                        elif alter == '-1':
-                            pitch += 'b'
-                        pitch += octave
-                        
-                        # Get duration type
-                        duration_type = note_elem.findtext('.//type', 'quarter', ns) or \
-                                       note_elem.findtext('.//type', 'quarter')
-                        
-                        note = Note(
-                            pitch=pitch,
-                            duration=duration_type,
-                            beat=1.0,  # TODO: Calculate from position
-                        )
-                        measure.notes.append(note)
-                
-                # Extract time signature
-                time_elem = measure_elem.find('.//time', ns) or measure_elem.find('.//time')
-                if time_elem is not None:
-                    beats = time_elem.findtext('beats', '', ns) or time_elem.findtext('beats', '')
-                    beat_type = time_elem.findtext('beat-type', '', ns) or time_elem.findtext('beat-type', '')
-                    if beats and beat_type:
-                        measure.time_signature = f"{beats}/{beat_type}"
-                        if not time_sig:
-                            time_sig = measure.time_signature
-                
-                # Extract key signature
-                key_elem = measure_elem.find('.//key', ns) or measure_elem.find('.//key')
-                if key_elem is not None:
-                    fifths = key_elem.findtext('fifths', '0', ns) or key_elem.findtext('fifths', '0')
-                    fifths_int = int(fifths)
-                    key_names = {
-                        -7: "Cb", -6: "Gb", -5: "Db", -4: "Ab", -3: "Eb", -2: "Bb", -1: "F",
-                        0: "C", 1: "G", 2: "D", 3: "A", 4: "E", 5: "B", 6: "F#", 7: "C#"
-                    }
-                    measure.key_signature = key_names.get(fifths_int, "C")
-                    if not key_sig:
-                        key_sig = measure.key_signature
-                
-                if measure.notes or measure.time_signature or measure.key_signature:
-                    measures.append(measure)
-        
         return OMRResult(
             success=True,
             engine="audiveris",
@@ -354,4 +517,4 @@ if __name__ == "__main__":
     print(f"Checking Audiveris: {find_audiveris()}")
     
     result = run_audiveris(image_path, output_dir)
-    print(json.dumps(omr_result_to_dict(result), indent=2))
+    print(orjson.dumps(omr_result_to_dict(result), option=orjson.OPT_INDENT_2).decode())
@@ -23,6 +23,10 @@ TIME_SIG_PATTERNS = [
     r"[Cc]\|",  # Cut time (C|)
 ]
 
+_TIME_SIG_RE = re.compile(TIME_SIG_PATTERNS[0])
+_TIME_SIG_DENOMINATORS = frozenset({"2", "4", "8", "16"})
+_COMMON_TIME_TEXTS = frozenset({"C", "COMMON TIME"})
+
 # Clef symbols (simplified detection)
 CLEF_PATTERNS = {
     "G": ["treble", "violin", "G-clef"],
@@ -65,17 +69,17 @@ def detect_time_signature_hint(
         text = block.get("text", "").strip()
         
         # Check for numeric time signatures
-        match = re.search(r"(\d+)/(\d+)", text)
+        match = _TIME_SIG_RE.search(text)
         if match:
             num, denom = match.groups()
             # Validate: denominator should be power of 2
-            if denom in ["2", "4", "8", "16"]:
+            if denom in _TIME_SIG_DENOMINATORS:
                 time_sig = f"{num}/{denom}"
                 logger.info(f"Detected time signature from text: {time_sig}")
                 return time_sig
         
         # Check for common time (C)
-        if text.upper() in ["C", "COMMON TIME"]:
+        if text.upper() in _COMMON_TIME_TEXTS:
             logger.info("Detected common time (C) from text")
             return "4/4"  # Common time = 4/4
     
@@ -99,7 +103,7 @@ def detect_clef_hint(
     
     Args:
         image: Full image
-        first_staff_region: First staff region image (if available)
+        first_staff_region: First staff region image (unused until symbol detection exists)
         staves: Detected staff systems
     
     Returns:
@@ -108,28 +112,9 @@ def detect_clef_hint(
     if not staves:
         return None
     
-    # Extract first staff region
-    first_staff = staves[0]
-    top_y = first_staff["top_y"]
-    bottom_y = first_staff["bottom_y"]
-    
-    # Get left portion of first staff (where clef typically appears)
-    staff_height = bottom_y - top_y
-    left_margin = int(image.shape[1] * 0.05)  # 5% from left
-    clef_width = int(image.shape[1] * 0.15)  # 15% width for clef area
-    
-    clef_region = image[
-        max(0, top_y - staff_height):min(image.shape[0], bottom_y + staff_height),
-        left_margin:min(image.shape[1], left_margin + clef_width)
-    ]
-    
-    if clef_region.size == 0:
-        return None
-    
-    # Simplified clef detection using pattern matching
-    # G-clef: typically has characteristic shape in upper staff
-    # F-clef: typically in lower staff
-    # For now, use heuristics based on staff position
+    # Simplified clef detection: no symbol matching yet, so the clef area
+    # pixels are not extracted. Heuristic based on first staff position only.
+    top_y = staves[0]["top_y"]
     
     # If first staff is in upper half of image → likely treble (G)
     if top_y < image.shape[0] * 0.5:
@@ -155,28 +140,28 @@ def smooth_key_signature(measures: list[dict[str, Any]]) -> list[dict[str, Any]]
     if not measures:
         return measures
     
-    # Find first valid key signature
+    # One pass: find first non-C key (fallback: first key of any kind, even C)
+    # and collect the measures that have no key to propagate to
     first_key: str | None = None
+    fallback_key: str | None = None
+    missing: list[dict[str, Any]] = []
     for measure in measures:
         key = measure.get("key_signature")
-        if key and key != "C":  # Skip default C
+        if not key:
+            missing.append(measure)
+        elif first_key is None and key != "C":  # Skip default C
             first_key = key
-            break
+        elif fallback_key is None:
+            fallback_key = key
     
-    # If no key found, try to find any key (even C)
     if not first_key:
-        for measure in measures:
-            key = measure.get("key_signature")
-            if key:
-                first_key = key
-                break
+        first_key = fallback_key
     
     # Propagate to all measures
     if first_key:
-        for measure in measures:
-            if not measure.get("key_signature"):
-                measure["key_signature"] = first_key
-                logger.debug(f"Propagated key {first_key} to measure {measure.get('number')}")
+        for measure in missing:
+            measure["key_signature"] = first_key
+            logger.debug(f"Propagated key {first_key} to measure {measure.get('number')}")
     
     return measures
 
@@ -11,6 +11,8 @@ import logging
 from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 # Duration type to beats mapping
@@ -25,6 +27,11 @@ DURATION_BEATS = {
     "breve": 8.0,
     "long": 16.0,
 }
+_DUR_GET = DURATION_BEATS.get
+
+# DURATION_BEATS as parallel arrays for vectorised closest-duration lookup
+_DUR_NAMES = tuple(DURATION_BEATS)
+_DUR_VALUES = np.array(list(DURATION_BEATS.values()), dtype=np.float64)
 
 
 def parse_time_signature(time_sig: str | None) -> float:
@@ -78,8 +85,11 @@ def duration_to_beats(duration: str) -> float:
     Returns:
         Beats (e.g., 1.0 for quarter, 2.0 for half)
     """
-    duration_lower = duration.lower()
-    return DURATION_BEATS.get(duration_lower, 1.0)  # Default to quarter
+    beats = _DUR_GET(duration)
+    if beats is None:
+        # MusicXML note types are already lowercase; only fold case on a miss
+        beats = _DUR_GET(duration.lower(), 1.0)  # Default to quarter
+    return beats
 
 
 def validate_measure_duration(
@@ -158,9 +168,11 @@ def correct_voice_excess(measure: dict[str, Any]) -> dict[str, Any]:
         return measure
     
     # Calculate total duration
-    total_beats = sum(duration_to_beats(n.get("duration", "quarter")) for n in notes)
+    durations = [duration_to_beats(n.get("duration", "quarter")) for n in notes]
+    total_beats = sum(durations)
     
     # If excess, normalize proportionally
+    closest: list[int] | None = None
     if total_beats > expected_beats + 0.1:  # Small tolerance
         scale_factor = expected_beats / total_beats
         
@@ -171,19 +183,22 @@ def correct_voice_excess(measure: dict[str, Any]) -> dict[str, Any]:
         
         # Adjust durations (simplified: reduce proportionally)
         # In practice, this might require more sophisticated note splitting
-        for note in notes:
-            current_duration = duration_to_beats(note.get("duration", "quarter"))
-            new_duration = current_duration * scale_factor
-            
-            # Find closest standard duration
-            closest_duration = min(
-                DURATION_BEATS.items(),
-                key=lambda x: abs(x[1] - new_duration)
-            )
-            note["duration"] = closest_duration[0]
+        new_durations = np.array(durations, dtype=np.float64) * scale_factor
+        
+        # Find closest standard duration (first in table order on ties)
+        closest = np.abs(_DUR_VALUES - new_durations[:, None]).argmin(axis=1).tolist()
     
-    # Reconstruct beat positions after duration changes
-    measure = reconstruct_time_offsets(measure)
+    # Apply adjusted durations and reconstruct beat positions in one pass
+    current_beat = 0.0
+    for i, note in enumerate(notes):
+        duration = durations[i]
+        if closest is not None:
+            closest_name = _DUR_NAMES[closest[i]]
+            note["duration"] = closest_name
+            duration = DURATION_BEATS[closest_name]
+        
+        note["beat"] = current_beat
+        current_beat += duration
     
     return measure
 
@@ -198,13 +213,30 @@ def normalize_rhythm(measures: list[dict[str, Any]]) -> list[dict[str, Any]]:
     Returns:
         Normalized measures
     """
+    normalized, _validations = normalize_rhythm_with_validation(measures)
+    return normalized
+
+
+def normalize_rhythm_with_validation(
+    measures: list[dict[str, Any]],
+) -> tuple[list[dict[str, Any]], list[tuple[bool, float, float]]]:
+    """
+    Normalize rhythm for all measures and return their validation results.
+    
+    Pass the validations to rhythm_to_dict to avoid validating every
+    measure a second time.
+    
+    Args:
+        measures: List of measure dicts
+    
+    Returns:
+        (normalized measures, (is_valid, expected_beats, actual_beats) per measure)
+    """
     normalized = []
+    validations: list[tuple[bool, float, float]] = []
     
     for measure in measures:
-        # Reconstruct time offsets
-        measure = reconstruct_time_offsets(measure)
-        
-        # Correct voice excess
+        # Correct voice excess (also reconstructs time offsets)
         measure = correct_voice_excess(measure)
         
         # Validate
@@ -216,18 +248,34 @@ def normalize_rhythm(measures: list[dict[str, Any]]) -> list[dict[str, Any]]:
             )
         
         normalized.append(measure)
+        validations.append((is_valid, expected, actual))
     
-    return normalized
+    return normalized, validations
 
 
-def rhythm_to_dict(measures: list[dict[str, Any]]) -> dict[str, Any]:
-    """Convert normalized measures to summary dict."""
+def rhythm_to_dict(
+    measures: list[dict[str, Any]],
+    validations: list[tuple[bool, float, float]] | None = None,
+) -> dict[str, Any]:
+    """
+    Convert normalized measures to summary dict.
+    
+    Args:
+        measures: Normalized measure dicts
+        validations: Per-measure results from normalize_rhythm_with_validation
+            (None = validate each measure here)
+    
+    Returns:
+        Summary dict with counts and mismatch messages
+    """
+    if validations is None:
+        validations = [validate_measure_duration(measure) for measure in measures]
+    
     total_measures = len(measures)
     corrected_count = 0
     errors: list[str] = []
     
-    for measure in measures:
-        is_valid, expected, actual = validate_measure_duration(measure)
+    for measure, (is_valid, expected, actual) in zip(measures, validations):
         if not is_valid:
             corrected_count += 1
             errors.append(
@@ -2,12 +2,24 @@
 
 import logging
 import re
+from bisect import bisect_right
 from typing import Any
 
 from src.schemas.models import Block, BlockType, Table
 
 logger = logging.getLogger(__name__)
 
+# Dotted leaders and digit runs in one scan; the two alternatives share no
+# characters, so every occurrence of either is reported
+_TOC_SCAN_RE = re.compile(r"(?P<dots>\.{3,})|(?P<num>\d+)")
+
+_TOC_KEYWORDS = ("sisällysluettelo", "sisallysluettelo", "contents", "table of contents")
+
+_SECTION_NUM_RE = re.compile(r"\d+\.\d+(?:\.\d+)?")  # e.g., "7.3" or "8.4.1"
+_DOT_RE = re.compile(r"\.{3,}")  # 3+ dots
+_PAGE_NUM_RE = re.compile(r"\b\d{1,3}\b")  # Page numbers (1-3 digits)
+_FIN_NUMERIC_RE = re.compile(r"[\d,.\-()]+")  # Numbers with formatting
+
 
 def is_toc_page(page_items: list[Block | Table]) -> bool:
     """
@@ -25,33 +37,31 @@ def is_toc_page(page_items: list[Block | Table]) -> bool:
     Returns:
         True if page looks like TOC
     """
-    # Collect all text from page
-    all_text = ""
+    # Check for TOC keywords item by item (stop at the first hit),
+    # collecting the text for the pattern checks below
+    parts: list[str] = []
     for item in page_items:
         if isinstance(item, Block):
-            all_text += " " + item.text
+            texts = [item.text]
         elif isinstance(item, Table) and item.cells:
-            for cell in item.cells:
-                all_text += " " + cell.text_raw
-    
-    text_lower = all_text.lower()
+            texts = [cell.text_raw for cell in item.cells]
+        else:
+            continue
+        
+        for text in texts:
+            text_lower = text.lower()
+            if any(keyword in text_lower for keyword in _TOC_KEYWORDS):
+                logger.debug("TOC detected: keyword found")
+                return True
+            parts.append(text)
     
-    # Check for TOC keywords
-    toc_keywords = ["sisällysluettelo", "sisallysluettelo", "contents", "table of contents"]
-    if any(keyword in text_lower for keyword in toc_keywords):
-        logger.debug("TOC detected: keyword found")
-        return True
+    all_text = " ".join(parts)
     
     # Check for TOC pattern: section numbers + dots + page numbers
     # Pattern: "7.3" or "8.4.1" followed by text, dots, and page number
-    section_num_pattern = re.compile(r"\d+\.\d+(?:\.\d+)?")  # e.g., "7.3" or "8.4.1"
-    dot_pattern = re.compile(r"\.{3,}")  # 3+ dots
-    page_num_pattern = re.compile(r"\b\d{1,3}\b")  # Page numbers (1-3 digits)
-    
-    # Count patterns in text
-    section_nums = len(section_num_pattern.findall(all_text))
-    dots = len(dot_pattern.findall(all_text))
-    page_nums = len(page_num_pattern.findall(all_text))
+    section_nums = len(_SECTION_NUM_RE.findall(all_text))
+    dots = len(_DOT_RE.findall(all_text))
+    page_nums = len(_PAGE_NUM_RE.findall(all_text))
     
     # TOC heuristics: multiple section numbers + dots + page numbers
     if section_nums >= 3 and dots >= 2 and page_nums >= 3:
@@ -87,29 +97,30 @@ def detect_toc_pattern(table: Table) -> bool:
     if not table.cells or len(table.cells) < 3:
         return False
     
-    # Count cells with dots
-    cells_with_dots = 0
-    cells_with_page_numbers = 0
-    numeric_cells = 0
     total_cells = len(table.cells)
-    
-    # Check for dotted leaders pattern
-    dot_pattern = re.compile(r"\.{3,}")  # 3+ dots
-    
-    for cell in table.cells:
-        text = cell.text_raw.strip()
-        
-        # Check for dots
-        if dot_pattern.search(text):
-            cells_with_dots += 1
-        
-        # Check for page numbers (right-aligned numbers, often at end of row)
-        if re.match(r"^\d+$", text):
-            cells_with_page_numbers += 1
-        
-        # Check for numeric content
-        if re.search(r"\d+", text):
-            numeric_cells += 1
+    texts = [cell.text_raw.strip() for cell in table.cells]
+    
+    # Page numbers: cells that are a bare number (equivalent to ^\d+$)
+    cells_with_page_numbers = sum(1 for text in texts if text.isdecimal())
+    
+    # Scan all cells as one buffer and map matches back to cell indices
+    starts: list[int] = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + 1
+    
+    dot_cells: set[int] = set()
+    numeric_cell_set: set[int] = set()
+    for match in _TOC_SCAN_RE.finditer("\n".join(texts)):
+        cell_idx = bisect_right(starts, match.start()) - 1
+        if match.lastgroup == "dots":
+            dot_cells.add(cell_idx)
+        else:
+            numeric_cell_set.add(cell_idx)
+    
+    cells_with_dots = len(dot_cells)
+    numeric_cells = len(numeric_cell_set)
     
     # TOC heuristics
     dot_ratio = cells_with_dots / total_cells if total_cells > 0 else 0
@@ -155,8 +166,7 @@ def validate_table_structure(table: Table) -> bool:
         return False
     
     # Count numeric cells
-    numeric_pattern = re.compile(r"[\d,.\-()]+")  # Numbers with formatting
-    numeric_cells = sum(1 for cell in table.cells if numeric_pattern.search(cell.text_raw))
+    numeric_cells = sum(1 for cell in table.cells if _FIN_NUMERIC_RE.search(cell.text_raw))
     numeric_ratio = numeric_cells / len(table.cells) if table.cells else 0
     
     # For financial statements, expect at least 10% numeric values
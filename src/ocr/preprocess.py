@@ -12,6 +12,79 @@ logger = logging.getLogger(__name__)
 # Preprocessing modes
 PreprocessMode = Literal["standard", "aggressive", "minimal"]
 
+# Skew detection runs on a copy downscaled to at most this width. Narrower
+# (~800px) loses thin staff lines and misreads skew on music pages.
+_SKEW_DETECT_MAX_WIDTH = 1000
+_HOUGH_THRESHOLD = 200  # Accumulator votes at full resolution
+
+
+def _has_opencv_cuda(*functions: str) -> bool:
+    """
+    Check if OpenCV was built with CUDA, sees a device, and provides the
+    given cv2.cuda functions (cudaimgproc/cuda_photo are optional modules).
+    """
+    try:
+        if cv2.cuda.getCudaEnabledDeviceCount() <= 0:
+            return False
+    except Exception:
+        return False
+    return hasattr(cv2, "cuda_GpuMat") and all(hasattr(cv2.cuda, name) for name in functions)
+
+
+_HAS_CUDA_ENHANCE = _has_opencv_cuda("createCLAHE", "bilateralFilter")
+_HAS_CUDA_DENOISE = _has_opencv_cuda("fastNlMeansDenoising")
+
+
+def _enhance_and_smooth(gray: np.ndarray) -> np.ndarray:
+    """
+    CLAHE contrast boost (clip 3.0, 8x8 tiles) followed by a 9px bilateral
+    filter (sigma 75/75).
+    
+    Both steps run on the GPU from a single upload when OpenCV has CUDA
+    support. Falls back to CPU otherwise.
+    """
+    if _HAS_CUDA_ENHANCE:
+        try:
+            gpu_image = cv2.cuda_GpuMat()
+            gpu_image.upload(gray)
+            clahe = cv2.cuda.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+            enhanced = clahe.apply(gpu_image, cv2.cuda.Stream_Null())
+            smoothed = cv2.cuda.bilateralFilter(enhanced, 9, 75, 75)
+            return smoothed.download()
+        except (cv2.error, AttributeError) as e:
+            logger.debug(f"CUDA CLAHE/bilateral failed, using CPU: {e}")
+    
+    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+    enhanced = clahe.apply(gray)
+    return cv2.bilateralFilter(enhanced, 9, 75, 75)
+
+
+def _denoise(image: np.ndarray, h: float) -> np.ndarray:
+    """
+    Non-local means denoising (7px template, 21px search window).
+    
+    Runs on the GPU when OpenCV has CUDA support - NL-means dominates
+    preprocessing time on full pages. Falls back to CPU otherwise.
+    """
+    if _HAS_CUDA_DENOISE:
+        try:
+            gpu_image = cv2.cuda_GpuMat()
+            gpu_image.upload(image)
+            denoised = cv2.cuda.fastNlMeansDenoising(
+                gpu_image, h, search_window=21, block_size=7
+            )
+            return denoised.download()
+        except (cv2.error, AttributeError) as e:
+            logger.debug(f"CUDA denoising failed, using CPU: {e}")
+    
+    return cv2.fastNlMeansDenoising(
+        image,
+        None,
+        h=h,
+        templateWindowSize=7,
+        searchWindowSize=21,
+    )
+
 
 def preprocess_for_ocr(
     image_path: Path | str,
@@ -55,11 +128,8 @@ def preprocess_for_ocr(
         logger.debug("Using aggressive preprocessing for bad OCR page")
         
         # Step 2a: Increase contrast with CLAHE
-        clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-        enhanced = clahe.apply(gray)
-        
         # Step 2b: Bilateral filter (edge-preserving smoothing)
-        smoothed = cv2.bilateralFilter(enhanced, 9, 75, 75)
+        smoothed = _enhance_and_smooth(gray)
         
         # Step 2c: Otsu's threshold (works well for scanned documents)
         _, binary = cv2.threshold(smoothed, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
@@ -72,14 +142,10 @@ def preprocess_for_ocr(
         # Closing (dilation + erosion) fills small holes
         closed = cv2.morphologyEx(opened, cv2.MORPH_CLOSE, kernel)
         
-        # Step 2e: Heavy denoising
-        denoised = cv2.fastNlMeansDenoising(
-            closed,
-            None,
-            h=20,  # Higher filter strength
-            templateWindowSize=7,
-            searchWindowSize=21,
-        )
+        # Step 2e: Remove leftover speckles
+        # Image is already binary here: a 3x3 median does what NL-means
+        # would at a fraction of the cost
+        denoised = cv2.medianBlur(closed, 3)
         
         # Step 2f: Deskew
         angle = detect_skew_angle(denoised)
@@ -102,13 +168,7 @@ def preprocess_for_ocr(
         )
         
         # Step 3: Denoise (light)
-        denoised = cv2.fastNlMeansDenoising(
-            binary,
-            None,
-            h=10,  # Filter strength
-            templateWindowSize=7,
-            searchWindowSize=21,
-        )
+        denoised = _denoise(binary, h=10)  # Filter strength
         
         # Step 4: Deskew
         angle = detect_skew_angle(denoised)
@@ -136,11 +196,20 @@ def detect_skew_angle(image: np.ndarray) -> float:
     Returns:
         Skew angle in degrees
     """
+    # Downscale large pages; the 1-degree theta resolution is unchanged
+    width = image.shape[1]
+    scale = _SKEW_DETECT_MAX_WIDTH / max(width, 1)
+    if scale < 1.0:
+        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    else:
+        scale = 1.0
+    
     # Use edge detection
     edges = cv2.Canny(image, 50, 150, apertureSize=3)
     
-    # Hough line transform
-    lines = cv2.HoughLines(edges, 1, np.pi / 180, 200)
+    # Hough line transform (votes shrink with line length, so scale threshold)
+    threshold = max(int(_HOUGH_THRESHOLD * scale), 30)
+    lines = cv2.HoughLines(edges, 1, np.pi / 180, threshold)
     
     if lines is None or len(lines) == 0:
         return 0.0
@@ -180,12 +249,13 @@ def rotate_image(image: np.ndarray, angle: float) -> np.ndarray:
     # Get rotation matrix
     rotation_matrix = cv2.getRotationMatrix2D(center, angle, 1.0)
     
-    # Rotate
+    # Rotate (bilinear: deskew angles are a few degrees, where cubic costs
+    # several times more per pixel for no visible OCR gain)
     rotated = cv2.warpAffine(
         image,
         rotation_matrix,
         (width, height),
-        flags=cv2.INTER_CUBIC,
+        flags=cv2.INTER_LINEAR,
         borderMode=cv2.BORDER_REPLICATE,
     )
     
@@ -3,6 +3,7 @@
 import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -102,6 +103,7 @@ def run_qa_checks(document: Document) -> QAReport:
     """Run all QA checks."""
     logger.info("Running QA checks...")
 
+    from checkers.base import BaseChecker  # noqa: E402
     from checkers.schema_checker import SchemaChecker  # noqa: E402
     from checkers.sum_checker import SumChecker  # noqa: E402
     from checkers.semantic_section_checker import SemanticSectionChecker  # noqa: E402
@@ -109,9 +111,10 @@ def run_qa_checks(document: Document) -> QAReport:
     from checkers.balance_sheet_checker import BalanceSheetChecker  # noqa: E402  # V8
     from checkers.crossref_checker import CrossRefChecker  # noqa: E402  # V8
     from checkers.diff_checker import DiffChecker  # noqa: E402  # V8
+    from checkers.document_index import DocumentIndex  # noqa: E402
 
     # Initialize checkers
-    checkers = [
+    checkers: list[BaseChecker] = [
         SchemaChecker(),
         SumChecker(),
         SemanticSectionChecker(),  # V7 Gate D
@@ -124,25 +127,33 @@ def run_qa_checks(document: Document) -> QAReport:
     all_findings: list[Finding] = []
     schema_valid = True
 
-    # Run all checkers
-    for checker in checkers:
-        try:
-            findings = checker.check(document)
-            all_findings.extend(findings)
-
-            if checker.name == "SchemaChecker" and findings:
-                schema_valid = False
+    # Shared page/item index so checkers don't each re-walk every page
+    index = DocumentIndex.from_document(document)
 
+    def run_checker(checker: BaseChecker) -> list[Finding]:
+        try:
+            return checker.check(document, index)
         except Exception as e:
             logger.error(f"Error running checker {checker.name}: {e}")
-            all_findings.append(
+            return [
                 Finding(
                     checker=checker.name,
                     page_index=0,
                     reason=f"Checker error: {e}",
                     severity=Severity.ERROR,
                 )
-            )
+            ]
+
+    # Run all checkers concurrently (read-only over document/index; DiffChecker's
+    # golden-file I/O overlaps with the others). map() keeps checker order.
+    with ThreadPoolExecutor(max_workers=len(checkers)) as executor:
+        results = list(executor.map(run_checker, checkers))
+
+    for checker, findings in zip(checkers, results):
+        all_findings.extend(findings)
+
+        if checker.name == "SchemaChecker" and findings:
+            schema_valid = False
 
     # Calculate table cell exactness
     total_cells = 0
@@ -1,5 +1,6 @@
 """Pydantic models for document structure."""
 
+import sys
 from enum import Enum
 from typing import Any, Literal, Optional
 
@@ -192,6 +193,12 @@ class Page(BaseModel):
     music_metadata: Optional[MusicMetadata] = Field(None, description="Music sheet metadata (if music_sheet)")
     items: list[Block | Table] = Field(default_factory=list, description="Page items (blocks and tables)")
 
+    @field_validator("semantic_section")
+    @classmethod
+    def intern_semantic_section(cls, v: Optional[str]) -> Optional[str]:
+        """Intern section names so repeated values share one string (cheap hashing/equality)."""
+        return sys.intern(v) if v is not None else None
+
 
 class PDFInfo(BaseModel):
     """PDF metadata."""
@@ -0,0 +1,48 @@
+"""Unit tests for src/music/detect.py"""
+
+import sys
+from pathlib import Path
+
+import cv2
+from pytest import skip
+
+# Add repo root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.music.detect import detect_staff_lines, is_music_sheet
+
+FIXTURE = Path(__file__).parent.parent / "data" / "00_input" / "Testidata nuottisivu" / "7x7.jpg"
+
+
+def _load_fixture():
+    """Load the 800px-wide music sheet fixture as grayscale."""
+    if not FIXTURE.exists():
+        skip("Fixture file not found")
+    return cv2.imread(str(FIXTURE), cv2.IMREAD_GRAYSCALE)
+
+
+def _rotate(image, angle: float):
+    """Rotate around the centre, filling the corners with white."""
+    height, width = image.shape
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(image, matrix, (width, height), borderValue=255)
+
+
+def test_detect_staff_lines_level() -> None:
+    """Test staff detection on the unrotated fixture."""
+    staves = detect_staff_lines(_load_fixture())
+    assert len(staves) >= 7
+    assert all(len(staff["lines"]) == 5 for staff in staves)
+
+
+def test_detect_staff_lines_slight_skew() -> None:
+    """Test that a 0.5 degree scan skew at native width keeps all staves."""
+    image = _load_fixture()
+    level_count = len(detect_staff_lines(image))
+
+    for angle in (0.5, -0.5):
+        staves = detect_staff_lines(_rotate(image, angle))
+        assert len(staves) == level_count
+
+    is_music, _, _ = is_music_sheet(_rotate(image, 0.5))
+    assert is_music